@@ -1,69 +1,244 @@
 """
 Main Flask application setup and entry point.
 
-This module initializes the Flask application, configures extensions
-(SQLAlchemy, CORS, LoginManager), sets up database connections,
-registers route blueprints, and defines the user loader function for
-Flask-Login. It also contains the main execution block to run the
-development server.
+This module provides the `create_app` application factory, which configures
+extensions (SQLAlchemy, CORS, LoginManager, Flask-Caching, Flask-Limiter), sets
+up database connections and registers route blueprints, and defines the user loader
+function for Flask-Login. It also contains the main execution block to run the
+development server; production servers load the app through `wsgi.py`.
 """
 
+# Standard library imports
+import hashlib
+import importlib
+import os
+from datetime import timedelta
+
 # Third-party imports
-from flask import Flask                 # Core Flask framework
-from flask_sqlalchemy import SQLAlchemy # ORM extension (although db instance is imported from database.py)
+import redis                            # Redis client used for server-side session storage
+from flask import Flask, request        # Core Flask framework and the request proxy
+from flask.sessions import SecureCookieSessionInterface  # Flask's default signed-cookie sessions
 from flask_cors import CORS             # Extension for handling Cross-Origin Resource Sharing
 from flask_login import LoginManager    # Extension for managing user sessions and login
+from flask_session import Session       # Extension for server-side session storage
+from sqlalchemy.engine import make_url  # Parses the database URI to pick engine options
 
 # Local application/library specific imports
-from routes.auth_routes import auth_bp          # Blueprint for authentication routes (/auth)
-from routes.module_routes import module_bp      # Blueprint for module-related routes (/modules)
-from routes.recommendation_routes import rec_bp # Blueprint for recommendation routes (/recommendations)
-from database import init_db                    # Function to initialize the database
+from database import db, init_db                # Database instance and initialization function
+from cache import init_cache                    # Response cache initialization function
+from rate_limit import init_limiter             # Rate limiter initialization function
+from log_config import init_logging             # Queue-based logging setup
+from json_provider import ORJSONProvider        # orjson-backed JSON provider for requests and responses
 from models import User                         # User model definition (needed for Flask-Login user loader)
 
-# Create the Flask application instance.
-# __name__ tells Flask where to look for resources like templates and static files.
-app = Flask(__name__)
-
-# Configuration
-app.config['SECRET_KEY'] = 'your_secret_key' # Replace with a secure key
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///database4.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-# Initialise the database
-init_db(app)
-
-CORS(app)
-
-# Enable session for Flask-Login to work
-# Configure the type of session storage. 'filesystem' stores session data
-# in files on the server. Other options include 'redis', 'memcached', 'sqlalchemy'.
-app.config['SESSION_TYPE'] = 'filesystem'
-
-# Configure if the session cookie is permanent. False means it's a session cookie
-# that typically expires when the browser is closed.
-app.config['SESSION_PERMANENT'] = False
-
-# Configure if the session cookie should only be sent over HTTPS.
-# Set this to True in production when using HTTPS for security.
-app.config['SESSION_COOKIE_SECURE'] = False # Set to True in production with HTTPS
-
-
-# Initialize the login manager
-login_manager = LoginManager(app)
+# Initialize the login manager.
+# Created once at import time and bound to the application in create_app().
+login_manager = LoginManager()
 
 # Make sure the login_manager knows where to redirect unauthorised users
 login_manager.login_view = 'auth.login_user_endpoint'
 
+# Tie each session to the client's IP address and user agent; a session cookie
+# replayed from elsewhere is discarded rather than trusted.
+login_manager.session_protection = 'strong'
+
 # Flask-Login user_loader
+# Session.get() checks the session identity map before issuing a SELECT.
+# Flask-Login stores the loaded user on `g` for the rest of the request,
+# so this runs at most once per request. User.modules is deliberately not
+# eager-loaded: no request handler reads it (the module lists are read per list
+# through the User get_* methods), so loading it would add a query per request.
+# The user is not cached across requests either: handlers modify and commit
+# current_user's module lists, and a copy cached in one worker process would go
+# stale when another worker updates the same user, silently discarding writes.
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))  # Retrieve user from database
-
-# Register Blueprints
-app.register_blueprint(auth_bp, url_prefix='/auth')
-app.register_blueprint(module_bp, url_prefix='/modules')
-app.register_blueprint(rec_bp, url_prefix='/recommendations')
+    return db.session.get(User, int(user_id))  # Retrieve user from database
+
+# Route blueprints registered by create_app(): (module path, blueprint attribute, URL prefix).
+# Modules are imported only when an app is created, not when this module is imported.
+BLUEPRINTS = (
+    ('routes.auth_routes', 'auth_bp', '/auth'),                         # Authentication routes
+    ('routes.module_routes', 'module_bp', '/modules'),                  # Module-related routes
+    ('routes.recommendation_routes', 'rec_bp', '/recommendations'),     # Recommendation routes
+)
+
+def short_circuit_cheap_requests():
+    """
+    Answer health checks and CORS preflight (OPTIONS) requests immediately with an empty 204.
+
+    Registered in create_app before any extension is set up, so it is the
+    first before_request hook: no rate limit check, view function, session
+    lookup or user loading (and therefore no database query) runs for a
+    liveness probe or a preflight; flask-cors still attaches the CORS headers
+    in its after_request hook.
+    """
+    if request.path == '/healthz' or request.method == 'OPTIONS':
+        return '', 204
+
+class CachedSerializerSessionInterface(SecureCookieSessionInterface):
+    """
+    Signed-cookie session interface that builds its serializer only once.
+
+    Flask's default interface creates a new itsdangerous serializer (and its
+    key derivation) for every request that opens or saves a session. The
+    secret key and salt don't change while the app is running, so the first
+    serializer is kept and reused. Each app gets its own instance.
+
+    Cookies are signed with HMAC-SHA256 instead of Flask's default SHA-1;
+    hashlib's OpenSSL SHA-256 uses the CPU's SHA extensions where available.
+    An unchanged session is not re-signed: Flask only writes the cookie when
+    the session was modified (sessions here are not permanent, so they aren't
+    refreshed on every request).
+    """
+
+    digest_method = staticmethod(hashlib.sha256)
+
+    def __init__(self):
+        self._serializer = None
+
+    def get_signing_serializer(self, app):
+        if self._serializer is None:
+            self._serializer = super().get_signing_serializer(app)
+        return self._serializer
+
+def engine_options(database_uri):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for a database URI.
+
+    An in-memory SQLite database lives in a single connection, so SQLAlchemy
+    gives it a StaticPool, which rejects the queue pool's size options; only
+    file and network databases get them.
+    """
+    url = make_url(database_uri)
+    if url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+    ):
+        return {}
+    return {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_recycle': 1800,
+        'pool_pre_ping': url.get_backend_name() != 'sqlite',
+    }
+
+def create_app(config=None):
+    """
+    Create and configure the Flask application.
+
+    Route blueprints are imported here rather than at module import time, and
+    no schema work happens at startup: tables are created explicitly with the
+    migrations run by `flask db upgrade` (see database.py).
+
+    Args:
+        config (dict, optional): Configuration values that override the defaults.
+
+    Returns:
+        Flask: The configured application instance.
+    """
+    # Write log records from a background thread (see log_config.py)
+    init_logging()
+
+    # Create the Flask application instance.
+    # __name__ tells Flask where to look for resources like templates and static files.
+    app = Flask(__name__)
+
+    # Serialize JSON responses (and parse JSON request bodies) with orjson.
+    app.json = ORJSONProvider(app)
+
+    # Configuration
+    # The signing key for session cookies is read from the environment. Without it a
+    # random key is generated, which is fine for development but logs everyone out on
+    # restart and is not shared between gunicorn workers unless the app is preloaded.
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY') or os.urandom(32)
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///database4.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    # Sessions are signed cookies by default: the session data (essentially the
+    # logged-in user id) travels with the request, so no server-side storage is
+    # read or written. The cookie is timestamped when signed, and Flask rejects
+    # it once it is older than this lifetime, so a stolen cookie stops working
+    # on its own.
+    app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=12)
+    # Keep the cookie out of reach of page scripts and off cross-site requests.
+    app.config['SESSION_COOKIE_HTTPONLY'] = True
+    app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+    # No remember-me: login_user() is never called with remember=True, and a zero
+    # duration keeps it that way, so the session cookie is the only credential
+    # and Flask-Login never has to check a second signed cookie.
+    app.config['REMEMBER_COOKIE_DURATION'] = timedelta(0)
+    # In development, log a warning for any request issuing more SQL statements
+    # than this, which usually means an N+1 query (see database.py).
+    if os.environ.get('FLASK_DEV'):
+        app.config['SQL_QUERY_WARNING_THRESHOLD'] = 10
+
+    if config:
+        app.config.update(config)
+
+    # Engine connection pool. Pooled connections (and the PRAGMAs applied to them in
+    # database.py) are reused across requests instead of being reopened each time.
+    # Pre-ping is only enabled for network databases, whose server may drop idle
+    # connections; for a local SQLite file it would add a round trip to every checkout.
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
+
+    # Answer health checks and preflights before any other before_request hook
+    # runs, including the ones the extensions below register (rate limiter)
+    app.before_request(short_circuit_cheap_requests)
+
+    # Initialise the database
+    init_db(app)
+
+    # Initialise the response cache used by read-mostly endpoints
+    init_cache(app)
+
+    # Initialise the rate limiter used by the login and registration endpoints
+    init_limiter(app)
+
+    # Cross-Origin Resource Sharing
+    # Only the API blueprints are exposed, and only to the known frontend origins
+    # (comma-separated in CORS_ORIGINS; defaults to the Expo web dev server).
+    # Credentials are allowed because the frontend sends the session cookie, and
+    # max_age lets browsers cache a preflight result for 24 hours instead of
+    # sending an OPTIONS request before every API call. The preflights that do
+    # arrive are answered by short_circuit_cheap_requests, registered above, before
+    # the rate limiter or any view runs; flask-cors adds its headers afterwards.
+    cors_origins = os.environ.get('CORS_ORIGINS', 'http://localhost:8081,http://localhost:19006').split(',')
+    CORS(
+        app,
+        resources={r"/auth/*": {}, r"/modules/*": {}, r"/recommendations/*": {}},
+        origins=cors_origins,
+        supports_credentials=True,
+        max_age=86400,
+    )
+
+    # Enable session for Flask-Login to work
+    # When SESSION_REDIS_URL is set, session data is stored in Redis through a
+    # pooled client, so each request costs one in-memory round trip instead of
+    # file I/O on the server. Otherwise Flask's default signed-cookie session is used.
+    session_redis_url = os.environ.get('SESSION_REDIS_URL')
+    if session_redis_url:
+        app.config['SESSION_TYPE'] = 'redis'
+        # Configure if the session cookie is permanent. False means it's a session cookie
+        # that typically expires when the browser is closed.
+        app.config['SESSION_PERMANENT'] = False
+        app.config['SESSION_REDIS'] = redis.Redis(
+            connection_pool=redis.BlockingConnectionPool.from_url(session_redis_url, max_connections=64)
+        )
+        Session(app)
+    else:
+        app.session_interface = CachedSerializerSessionInterface()
+
+    login_manager.init_app(app)
+
+    # Register Blueprints
+    for module_path, blueprint_name, url_prefix in BLUEPRINTS:
+        blueprint = getattr(importlib.import_module(module_path), blueprint_name)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+
+    return app
 
 if __name__ == "__main__":
-    app.run(debug=True, host='0.0.0.0', port=5000)  # Allow external devices to access
+    # Werkzeug development server, for local use only. Debug mode (reloader and
+    # interactive debugger) is enabled with FLASK_DEV=1. In production serve the
+    # app through wsgi.py with gunicorn instead (see README).
+    create_app().run(debug=bool(os.environ.get('FLASK_DEV')), threaded=True, host='0.0.0.0', port=5000)  # Allow external devices to access
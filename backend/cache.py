@@ -0,0 +1,75 @@
+"""
+Response cache module.
+
+This module sets up the Flask-Caching instance shared by the route blueprints
+and provides a function to bind it to the Flask application.
+"""
+
+import functools
+import os
+
+from flask import current_app, request
+from flask_caching import Cache
+
+# Create a global cache instance.
+# Blueprints import it to decorate read-mostly GET endpoints with `@cache.cached`.
+# It's initialized without an app here, and bound to the Flask app later in `init_cache`.
+cache = Cache()
+
+def cache_success_only(rv):
+    """
+    Response filter for `@cache.cached`: only cache successful (2xx) responses.
+
+    Error responses (e.g. 404 for an unknown module) are recomputed on the next
+    request instead of being served from the cache.
+    """
+    return 200 <= current_app.make_response(rv).status_code < 300
+
+def with_etag(view):
+    """
+    Decorator adding an ETag (a hash of the body) to a view's 200 responses.
+
+    Place it under `@cache.cached`, so the tag is computed when the response is
+    built and then stored in the cache with it. `conditional_response` uses the
+    tag to answer repeat requests with 304 Not Modified.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response.add_etag()
+        return response
+    return wrapper
+
+def conditional_response(response):
+    """
+    after_request hook: turn a GET response into 304 Not Modified when the
+    client's If-None-Match already names its ETag, so the body isn't resent.
+    """
+    if request.method == 'GET' and response.get_etag()[0]:
+        response.make_conditional(request)
+    return response
+
+def init_cache(app):
+    """
+    Configure and bind the cache to the Flask application.
+
+    Uses Redis when CACHE_REDIS_URL is set, so all worker processes share one
+    cache; otherwise falls back to a per-process in-memory cache. With several
+    worker processes and no Redis, `cache.clear()` only empties the cache of
+    the process that calls it: the others keep serving their copies until
+    they expire (CACHE_DEFAULT_TIMEOUT, 60 s).
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    redis_url = os.environ.get('CACHE_REDIS_URL')
+    if redis_url:
+        app.config.setdefault('CACHE_TYPE', 'RedisCache')
+        app.config.setdefault('CACHE_REDIS_URL', redis_url)
+    else:
+        app.config.setdefault('CACHE_TYPE', 'SimpleCache')
+    app.config.setdefault('CACHE_DEFAULT_TIMEOUT', 60)
+    # Scope keys so cache.clear() only removes this application's entries.
+    app.config.setdefault('CACHE_KEY_PREFIX', 'module_insight:')
+    cache.init_app(app)
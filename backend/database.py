@@ -1,29 +1,102 @@
 """
 Database initialization module.
 
-This module sets up the SQLAlchemy database instance and provides a function
-to initialize the database tables within the Flask application context.
+This module sets up the SQLAlchemy database instance and the Flask-Migrate
+(Alembic) extension, and provides a function to bind both to the Flask
+application. The schema is managed by the migrations in `migrations/` and
+applied with `flask db upgrade`.
 """
 
 # Import the Flask-SQLAlchemy extension.
 # Flask-SQLAlchemy simplifies using SQLAlchemy with Flask applications by handling
 # session management, configuration, and integration with the Flask app context.
 
+import os
+import sqlite3
+
+from flask import g, has_request_context, request
+from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 # Create a global SQLAlchemy database instance.
 # This instance will be used throughout the application to interact with the database,
 # define models, and perform queries. It's initialized without an app here,
 # and will be bound to the Flask app later using `init_app`.
+#
+# Objects are not expired on commit. Sessions last one request, and views that
+# commit then build their response from the same objects (the new user in
+# register, current_user after changing a module list); with expiry each of those
+# reads would re-SELECT the row that was just written.
+
+db = SQLAlchemy(session_options={'expire_on_commit': False})
+
+# Flask-Migrate exposes Alembic as `flask db ...`. Migration scripts live next to
+# this file, so the commands work regardless of the current working directory.
+# Batch mode lets autogenerated ALTERs run on SQLite, which rebuilds the table.
+migrate = Migrate(
+    directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'),
+    render_as_batch=True,
+)
+
+# PRAGMAs applied to every new SQLite connection.
+# - journal_mode=WAL lets readers proceed while a single writer commits, instead of
+#   blocking on the rollback journal (the mode is persisted in the database file).
+# - synchronous=NORMAL is safe under WAL and avoids an fsync on every commit.
+# - temp_store=MEMORY keeps temporary tables and indices off disk.
+# - mmap_size maps up to 256 MiB of the file, avoiding read() syscalls on hot pages.
+# - cache_size=-65536 gives each connection a 64 MiB page cache (negative = KiB).
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Apply SQLITE_PRAGMAS to a freshly opened DBAPI connection.
+
+    Registered as a SQLAlchemy "connect" event listener. Connections from other
+    drivers (e.g. PostgreSQL or MySQL in production) are left untouched.
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """Count the SQL statements issued during the current request (a "before_cursor_execute" listener)."""
+    if has_request_context():
+        g.sql_query_count = g.get('sql_query_count', 0) + 1
+
+def _init_query_count_warning(app, threshold):
+    """
+    Log a warning for each request that issues more than `threshold` SQL statements.
+
+    Development aid for spotting N+1 queries, such as a lazy-loaded relationship
+    read once per row of a listing. Enabled with SQL_QUERY_WARNING_THRESHOLD.
+    """
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _count_query)
 
-db = SQLAlchemy()
+    @app.after_request
+    def warn_on_query_count(response):
+        count = g.get('sql_query_count', 0)
+        if count > threshold:
+            app.logger.warning("%s %s issued %d SQL statements", request.method, request.path, count)
+        return response
 
 def init_db(app):
     """
-    Initialize the SQLAlchemy database instance and create database tables.
+    Initialize the SQLAlchemy database instance.
 
-    This function binds the `db` instance to the provided Flask `app` and then,
-    within the application context, creates all tables defined by the SQLAlchemy
-    models registered with the `db` instance.
+    This function binds the `db` instance to the provided Flask `app`, tunes
+    the connections its engine opens, and registers the `flask db` migration
+    commands. The schema is not touched here; run `flask db upgrade` at deploy
+    time for that.
 
     Args:
         app (Flask): The Flask application instance.
@@ -34,13 +107,15 @@ def init_db(app):
     # tied to the application context.
     db.init_app(app)
     # Create an application context.
-    # Operations that interact with the database (like creating tables)
-    # often require access to the application's configuration and resources,
-    # which are available within an application context.
+    # Accessing the engine requires the application's configuration,
+    # which is available within an application context.
     with app.app_context():
-        # Create all database tables defined in the models.
-        # This command inspects all models registered with the `db` instance
-        # (subclasses of db.Model) and issues CREATE TABLE statements
-        # to the database for any tables that don't already exist.
-        # It should typically be run once during setup or when models change.
-        db.create_all()
+        # Tune every connection the engine opens (no-op for non-SQLite databases).
+        # Registered before any query so the first pooled connection is covered too.
+        event.listen(db.engine, "connect", _set_sqlite_pragmas)
+    # Count queries per request in development (see _init_query_count_warning).
+    threshold = app.config.get('SQL_QUERY_WARNING_THRESHOLD')
+    if threshold:
+        _init_query_count_warning(app, threshold)
+    # Make `flask db upgrade` and the other migration commands available.
+    migrate.init_app(app, db)
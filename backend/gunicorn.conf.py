@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration.
+
+Loaded automatically when gunicorn is started from the backend directory
+(`gunicorn wsgi:app`). Values can be overridden with the GUNICORN_*
+environment variables below or with the usual command-line flags.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# One worker process per CPU core.
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+
+# Threaded workers: each process serves requests from a pool of threads. The
+# sqlite3 driver and socket calls release the GIL while they wait, so the I/O
+# of concurrent requests already overlaps. Greenlet workers (gevent) would not
+# add anything here, since SQLite's file I/O happens inside the C library and
+# is not made cooperative by gevent's monkey-patching.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Build the app once in the master and fork the workers from it (see wsgi.py).
+preload_app = True
+
+def on_starting(server):
+    """Warn when several workers would each keep their own response cache."""
+    if workers > 1 and not os.environ.get('CACHE_REDIS_URL'):
+        server.log.warning(
+            "CACHE_REDIS_URL is not set: each of the %d workers caches catalog "
+            "responses in its own memory, so after a module is added or the "
+            "database is reseeded, other workers may serve the old responses for "
+            "up to CACHE_DEFAULT_TIMEOUT (60 s).", workers
+        )
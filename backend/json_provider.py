@@ -0,0 +1,53 @@
+"""
+JSON provider module.
+
+This module defines an orjson-based replacement for Flask's default JSON
+provider. Once installed on the app (`app.json = ORJSONProvider(app)`), every
+`jsonify(...)` call, dict/list returned from a view and `request.get_json()`
+goes through orjson instead of the standard library `json` module.
+"""
+
+import decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+# Options used for every dump: accept int/UUID/etc. dict keys, as the stdlib
+# encoder does, instead of raising.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def _default(obj):
+    """
+    Serialize the types Flask's default provider supports but orjson doesn't.
+
+    datetimes, dates, UUIDs and dataclasses are handled by orjson natively.
+    """
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    orjson encodes straight to bytes in compiled code, so responses skip the
+    pure-Python encoder and the str -> bytes re-encode. Keys are emitted in
+    insertion order rather than sorted.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand the encoded bytes to the response directly instead of going
+        # through dumps(), which has to return a str.
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS),
+            mimetype='application/json',
+        )
@@ -0,0 +1,72 @@
+"""
+Logging setup module.
+
+Request handlers log through the standard `logging` module
+(`logging.getLogger(__name__)`). This module routes those records through a
+queue: the request thread only puts the record on the queue, and a background
+thread formats it and writes it to stderr, so no request waits on console or
+pipe I/O.
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Format of every log line, the same as Flask's default handler.
+LOG_FORMAT = '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
+
+_queue_handler = None
+_listener = None
+
+def _start_listener():
+    """Start the thread that writes queued records to stderr."""
+    global _listener
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = QueueListener(_queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+def _stop_listener():
+    """Write out any records still queued when the process exits."""
+    if _listener is not None:
+        _listener.stop()
+
+def _restart_listener_after_fork():
+    """
+    Give a forked child (a gunicorn worker) its own queue and writer thread.
+
+    Threads don't survive a fork, so the writer started in the gunicorn master
+    (where the app is preloaded) doesn't exist in the workers.
+    """
+    if _queue_handler is not None:
+        _queue_handler.queue = queue.SimpleQueue()
+        _start_listener()
+
+def init_logging():
+    """
+    Send records from all loggers through the background writer.
+
+    Does nothing if the root logger already has a QueueHandler, so creating
+    several apps doesn't add duplicate handlers or writer threads. The root
+    level is only set (to INFO) when nothing else has configured logging yet;
+    a level chosen by gunicorn, a test runner or embedding code is kept.
+    Called before anything touches `app.logger`: Flask only adds its own,
+    synchronous stderr handler when no handler is configured yet.
+    """
+    global _queue_handler
+    root = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root.handlers):
+        return
+    if not root.handlers and root.level == logging.WARNING:
+        root.setLevel(logging.INFO)
+    first_call = _queue_handler is None
+    if _listener is not None:
+        _listener.stop()
+    _queue_handler = QueueHandler(queue.SimpleQueue())
+    root.addHandler(_queue_handler)
+    _start_listener()
+    if first_call:
+        os.register_at_fork(after_in_child=_restart_listener_after_fork)
+        atexit.register(_stop_listener)
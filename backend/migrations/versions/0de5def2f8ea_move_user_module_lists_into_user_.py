@@ -0,0 +1,112 @@
+"""move user module lists into user_modules rows
+
+Revision ID: 0de5def2f8ea
+Revises: 42fa9e8d10c6
+Create Date: 2026-10-15 23:07:26.115895
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0de5def2f8ea'
+down_revision = '42fa9e8d10c6'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# The four JSON list columns on "user", which are also the UserModules.kind values
+# (saved_modules -> 'saved', ...).
+KINDS = ('saved', 'taught', 'selected', 'recommended')
+
+user_table = sa.table(
+    'user',
+    sa.column('id', sa.Integer),
+    *(sa.column(f'{kind}_modules', sa.JSON) for kind in KINDS),
+)
+module_table = sa.table('module', sa.column('id', sa.Integer), sa.column('name', sa.String))
+
+
+def upgrade():
+    # The old user_modules table had no list kind and was never written by the app,
+    # so it is replaced rather than altered.
+    op.drop_table('user_modules')
+    user_modules = op.create_table('user_modules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('module_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=12), nullable=False),
+    sa.ForeignKeyConstraint(['module_id'], ['module.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'kind', 'module_id', name='uq_user_modules_user_kind_module')
+    )
+
+    # Copy every list into rows, in list order. Names are matched to the first
+    # module with that name; names with no module are dropped.
+    bind = op.get_bind()
+    module_ids = {}
+    for module_id, name in bind.execute(sa.select(module_table.c.id, module_table.c.name).order_by(module_table.c.id)):
+        module_ids.setdefault(name, module_id)
+
+    rows = []
+    dropped = 0
+    for user in bind.execute(sa.select(user_table)).mappings():
+        for kind in KINDS:
+            names = user[f'{kind}_modules'] or []
+            for name in dict.fromkeys(names):
+                if name in module_ids:
+                    rows.append({'user_id': user['id'], 'kind': kind, 'module_id': module_ids[name]})
+                else:
+                    dropped += 1
+                    logger.warning("Dropping unknown module %r from user %s's %s list", name, user['id'], kind)
+    if rows:
+        op.bulk_insert(user_modules, rows)
+    logger.info("Copied %d module list entries, dropped %d with no matching module", len(rows), dropped)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        for kind in KINDS:
+            batch_op.drop_column(f'{kind}_modules')
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        for kind in KINDS:
+            batch_op.add_column(sa.Column(f'{kind}_modules', sa.JSON(), nullable=True))
+
+    # Rebuild the JSON lists from the rows, in the order they were added.
+    bind = op.get_bind()
+    user_modules = sa.table(
+        'user_modules',
+        sa.column('id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('module_id', sa.Integer),
+        sa.column('kind', sa.String),
+    )
+    lists = {}
+    for user_id, kind, name in bind.execute(
+        sa.select(user_modules.c.user_id, user_modules.c.kind, module_table.c.name)
+        .join(module_table, module_table.c.id == user_modules.c.module_id)
+        .order_by(user_modules.c.id)
+    ):
+        lists.setdefault(user_id, {k: [] for k in KINDS})[kind].append(name)
+    for user_id in bind.execute(sa.select(user_table.c.id)).scalars():
+        values = lists.get(user_id, {k: [] for k in KINDS})
+        bind.execute(
+            user_table.update()
+            .where(user_table.c.id == user_id)
+            .values({f'{kind}_modules': values[kind] for kind in KINDS})
+        )
+
+    op.drop_table('user_modules')
+    op.create_table('user_modules',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('module_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['module_id'], ['module.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'module_id')
+    )
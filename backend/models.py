@@ -1,21 +1,221 @@
 """
 Database models for the Flask application.
 
-This module defines the SQLAlchemy ORM models for User, Module, UserModules (association table),
-and TopicByModule, along with methods for interacting with user-specific module lists
+This module defines the SQLAlchemy ORM models for User, Module, UserModules (the rows
+behind each user's module lists), and TopicByModule, along with methods for interacting with user-specific module lists
 and authentication.
 """
 
-# Import necessary components from SQLAlchemy for defining relationships.
-from sqlalchemy.orm import relationship
+# Import necessary components from SQLAlchemy for defining relationships and statements.
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.types import Text, TypeDecorator
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import deferred, relationship
 # Import the database instance initialized elsewhere (likely in app setup).
 from database import db
-# Import password hashing utilities from Werkzeug.
-from werkzeug.security import generate_password_hash, check_password_hash
-# Import json for handling JSON data stored in text columns.
-import json
+# Import the Argon2id password hasher.
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+# Import Werkzeug's password check, still used for hashes created before Argon2id.
+from werkzeug.security import check_password_hash
+# Import orjson for reading and writing JSON data stored in text columns.
+import orjson
+# Import logging for warnings about module names that match no module.
+import logging
+# Import os and lru_cache for building the dummy password hash once.
+import os
+from functools import lru_cache
+# Import ThreadPoolExecutor for the pool that password hashes run on.
+from concurrent.futures import ThreadPoolExecutor
 # Import UserMixin for Flask-Login integration.
 from flask_login import UserMixin
+# Import the request-scoped `g` namespace used to cache module lists per request.
+from flask import g, has_request_context
+
+logger = logging.getLogger(__name__)
+
+# Argon2id hasher used for all passwords. Argon2id is memory-hard: every guess
+# needs 64 MiB of RAM, which makes GPU/ASIC cracking far more expensive than
+# PBKDF2 for the same verification time (about 0.15 s here).
+password_hasher = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=4)
+
+# Hashes and verifications (including checks of legacy PBKDF2 hashes) run on
+# this pool, at most one per CPU core per process.
+# argon2 releases the GIL, so hashes from concurrent request threads already run
+# in parallel; the pool caps how many do at once, so a burst of logins queues
+# instead of oversubscribing the cores and allocating 64 MiB per request thread.
+# Threads are started on first use, i.e. in the gunicorn workers after the fork.
+_password_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('PASSWORD_HASH_THREADS', os.cpu_count() or 1)),
+    thread_name_prefix='password-hash',
+)
+
+def _hash_password(password):
+    """Hash a password on the password pool."""
+    return _password_pool.submit(password_hasher.hash, password).result()
+
+def _verify_password(password_hash, password):
+    """Verify a password on the password pool; raises like PasswordHasher.verify."""
+    return _password_pool.submit(password_hasher.verify, password_hash, password).result()
+
+def _verify_legacy_password(password_hash, password):
+    """Check a password against a Werkzeug (pre-Argon2id) hash on the password pool; returns a bool."""
+    return _password_pool.submit(check_password_hash, password_hash, password).result()
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash():
+    """Hash of a random password, generated on first use with the same method as set_password."""
+    return _hash_password(os.urandom(16).hex())
+
+class JSONList(TypeDecorator):
+    """
+    A list stored as JSON text.
+
+    The text is parsed once when the row is loaded, so the attribute is already a
+    Python list wherever it is read. Lists are replaced rather than changed in
+    place; in-place changes are not detected.
+    """
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return orjson.dumps(value or []).decode()
+
+    def process_result_value(self, value, dialect):
+        return orjson.loads(value) if value else []
+
+def check_dummy_password(password):
+    """
+    Verify a password against a dummy hash and return False.
+
+    Called when a login names an email with no account, so the request spends as
+    long hashing as one with a wrong password, and response timing doesn't reveal
+    which emails are registered.
+    """
+    try:
+        _verify_password(_dummy_password_hash(), password)
+    except VerificationError:
+        pass
+    return False
+
+# The module lists a user can keep, stored as UserModules.kind.
+MODULE_LIST_KINDS = ('saved', 'taught', 'selected', 'recommended')
+
+# The values User.role may take. The database enforces them with a CHECK
+# constraint (or a native enum type on PostgreSQL/MySQL).
+USER_ROLES = ('Student', 'Teacher')
+
+def _insert_ignoring_duplicates(model):
+    """
+    INSERT statement for `model` that skips rows violating a unique constraint.
+
+    Uses the dialect's own form (ON CONFLICT DO NOTHING on SQLite/PostgreSQL,
+    ON DUPLICATE KEY UPDATE id = id on MySQL), so the database does the
+    duplicate check. Other errors (NOT NULL, bad values) still raise; MySQL's
+    INSERT IGNORE would turn those into warnings and insert a coerced row.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return sqlite.insert(model).on_conflict_do_nothing()
+    if dialect == 'postgresql':
+        return postgresql.insert(model).on_conflict_do_nothing()
+    return mysql.insert(model).on_duplicate_key_update(id=model.__table__.c.id)
+
+# MySQL error code for a duplicate key (ER_DUP_ENTRY).
+MYSQL_DUPLICATE_ENTRY = 1062
+
+def _insert_unless_duplicate(model, values):
+    """
+    Insert one row into `model`'s table, unless it violates a unique constraint.
+
+    Returns True if the row was inserted and False if it was a duplicate. The
+    caller commits (or rolls back).
+    """
+    if db.session.get_bind().dialect.name != 'mysql':
+        return db.session.execute(_insert_ignoring_duplicates(model).values(values)).rowcount == 1
+    # SQLAlchemy's MySQL drivers count matched rather than changed rows, so a
+    # skipped duplicate reports a rowcount of 1 as well. Insert in a savepoint
+    # instead and treat only a duplicate key error as "already exists".
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(model).values(values))
+    except IntegrityError as error:
+        if error.orig.args[0] != MYSQL_DUPLICATE_ENTRY:
+            raise
+        return False
+    return True
+
+# Rows per INSERT batch in bulk_insert. Each batch is one executemany call, so
+# a seed of any size never holds more than this many parameter sets at once.
+BULK_INSERT_BATCH_SIZE = 10_000
+
+def _upsert(model, key, columns):
+    """
+    INSERT statement for `model` that updates `columns` of the existing row
+    instead when the unique column `key` already holds the value.
+
+    Uses the dialect's own form (ON CONFLICT (key) DO UPDATE on SQLite/PostgreSQL,
+    ON DUPLICATE KEY UPDATE on MySQL), so the existing row keeps its id.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        stmt = (sqlite if dialect == 'sqlite' else postgresql).insert(model)
+        return stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={column: stmt.excluded[column] for column in columns if column != key},
+        )
+    stmt = mysql.insert(model)
+    return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in columns if column != key})
+
+def _bulk_insert(model, rows, batch_size, stmt=None):
+    """
+    Insert `rows` (an iterable of column -> value dicts) into `model`'s table.
+
+    Each batch is a single executemany INSERT (or `stmt`, if given), with no
+    ORM objects built per row. The caller commits.
+    """
+    if stmt is None:
+        stmt = insert(model)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            db.session.execute(stmt, batch)
+            batch = []
+    if batch:
+        db.session.execute(stmt, batch)
+
+def _module_list_cache():
+    """
+    Per-request cache of module lists, keyed by (user id, kind).
+
+    Lives on flask.g, so it is dropped at the end of every request and never
+    shared between requests. Returns None outside a request (e.g. in scripts).
+    """
+    if not has_request_context():
+        return None
+    return g.setdefault('module_lists', {})
+
+class UserModules(db.Model):
+    """
+    Links a user to a module on one of their module lists.
+
+    Each row puts one module on one list; `kind` says which list (one of
+    MODULE_LIST_KINDS). The auto-increment `id` keeps the order in which modules
+    were added, and the unique (user_id, kind, module_id) constraint stops a module
+    appearing twice on the same list. Its index also serves the
+    "user X's saved modules" lookups.
+    """
+    __tablename__ = 'user_modules'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'kind', 'module_id', name='uq_user_modules_user_kind_module'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    module_id = db.Column(db.Integer, db.ForeignKey('module.id'), nullable=False)
+    kind = db.Column(db.String(12), nullable=False)
 
 class User(UserMixin, db.Model):
     """
@@ -24,55 +224,187 @@ class User(UserMixin, db.Model):
     Inherits from UserMixin to provide default implementations for Flask-Login
     required properties (is_authenticated, is_active, is_anonymous, get_id).
     Inherits from db.Model to integrate with SQLAlchemy ORM.
+
+    The user's saved, taught, selected and recommended modules are rows in
+    UserModules, read and changed through the get_/add_/remove_/set_ methods
+    below. Changes are executed in the current session; the caller commits.
     """
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100))
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(200), nullable=False)
-    role = db.Column(db.String(10), nullable=False)
+    # Only the login view needs the hash, so it is left out of the row that
+    # load_user fetches on every authenticated request.
+    password_hash = deferred(db.Column(db.String(200), nullable=False))
+    role = db.Column(db.Enum(*USER_ROLES, name='user_role', create_constraint=True), nullable=False)
     year = db.Column(db.String(10), nullable=True)
-    saved_modules = db.Column(db.Text, default="[]")  # Store as JSON string
-    taught_modules = db.Column(db.Text, default="[]")  # Store as JSON string
-    selected_modules = db.Column(db.Text, default="[]")
-    recommended_modules = db.Column(db.Text, default="[]")
-    
+
+    ## ---------- MODULE LIST HELPERS ----------
+    def _get_modules(self, kind):
+        """
+        Names of the modules on one of the user's lists, in the order they were added.
+
+        Queried at most once per list per request; the add/remove/set helpers
+        below clear the cached copy when they change the list.
+        """
+        cache = _module_list_cache()
+        key = (self.id, kind)
+        if cache is None or key not in cache:
+            modules = list(db.session.scalars(
+                select(Module.name)
+                .join(UserModules, UserModules.module_id == Module.id)
+                .where(UserModules.user_id == self.id, UserModules.kind == kind)
+                .order_by(UserModules.id)
+            ))
+            if cache is None:
+                return modules
+            cache[key] = modules
+        # Return a copy so callers can't modify the cached list
+        return list(cache[key])
+
+    def _count_modules(self, kind):
+        """
+        Number of modules on one of the user's lists.
+
+        Uses the request-cached list if it was already read; otherwise the
+        database counts the rows (SELECT count(*)) instead of returning every name.
+        """
+        cache = _module_list_cache()
+        if cache is not None and (self.id, kind) in cache:
+            return len(cache[(self.id, kind)])
+        return db.session.scalar(
+            select(func.count())
+            .select_from(UserModules)
+            .join(Module, UserModules.module_id == Module.id)
+            .where(UserModules.user_id == self.id, UserModules.kind == kind)
+        )
+
+    def _forget_modules(self, kind):
+        """Drop the request-cached copy of a list after changing it."""
+        cache = _module_list_cache()
+        if cache is not None:
+            cache.pop((self.id, kind), None)
+
+    def _add_module(self, kind, module_name):
+        """
+        Append a module to one of the user's lists, unless it is already there.
+
+        A single INSERT ... SELECT resolves the module name in the database, and
+        the unique (user_id, kind, module_id) constraint turns a duplicate into a
+        no-op, even when two requests add the same module at once.
+
+        Returns False, and adds nothing, if no module has that name.
+        """
+        self._forget_modules(kind)
+        result = db.session.execute(
+            _insert_ignoring_duplicates(UserModules).from_select(
+                ['user_id', 'kind', 'module_id'],
+                select(literal(self.id), literal(kind), Module.id)
+                .where(Module.name == module_name)
+                .limit(1),
+            )
+        )
+        if result.rowcount:
+            return True
+        # Nothing inserted: either the module is already on the list or it doesn't exist
+        return db.session.scalar(select(select(Module.id).where(Module.name == module_name).exists()))
+
+    def _remove_module(self, kind, module_name):
+        """Remove a module from one of the user's lists (no-op if it isn't there)."""
+        self._forget_modules(kind)
+        db.session.execute(
+            delete(UserModules).where(
+                UserModules.user_id == self.id,
+                UserModules.kind == kind,
+                UserModules.module_id.in_(select(Module.id).where(Module.name == module_name)),
+            )
+        )
+
+    def _set_modules(self, kind, module_names):
+        """
+        Replace one of the user's lists, keeping the given order and dropping
+        duplicates and names that don't match a module.
+        """
+        module_names = list(dict.fromkeys(module_names))
+        # Resolve all names in one query, then leave out the unknown ones
+        module_ids = dict(db.session.execute(
+            select(Module.name, Module.id).where(Module.name.in_(module_names))
+        ).all()) if module_names else {}
+        unknown = [name for name in module_names if name not in module_ids]
+        if unknown:
+            logger.warning("Skipping unknown modules on user %s's %s list: %s", self.id, kind, unknown)
+            module_names = [name for name in module_names if name in module_ids]
+        # Nothing to write if the list already holds exactly these modules
+        if module_names == self._get_modules(kind):
+            return
+        self._forget_modules(kind)
+        db.session.execute(
+            delete(UserModules).where(UserModules.user_id == self.id, UserModules.kind == kind)
+        )
+        if not module_names:
+            return
+        db.session.execute(
+            insert(UserModules),
+            [{'user_id': self.id, 'kind': kind, 'module_id': module_ids[name]} for name in module_names],
+        )
+
+    ## ---------- SELECTED MODULES METHODS ----------
     def get_selected_modules(self):
-        # Convert the JSON string back to a Python list
-        return json.loads(self.selected_modules)
+        """Retrieve selected modules as a Python list."""
+        return self._get_modules('selected')
     
     def add_selected_module(self, module_name):
-        """Add a module to saved_modules and update the database."""
-        modules = self.get_selected_modules()
-        if module_name not in modules:
-            modules.append(module_name)
-            self.selected_modules = json.dumps(modules)
-            db.session.commit()
+        """Add a module to selected_modules; False if no module has that name. The caller commits the change."""
+        return self._add_module('selected', module_name)
     
     def remove_selected_module(self, module_name):
-        """Remove a module from selected_modules and update the database."""
-        modules = self.get_selected_modules()
-        if module_name in modules:
-            modules.remove(module_name)
-            self.selected_modules = json.dumps(modules)
-            db.session.commit()
+        """Remove a module from selected_modules. The caller commits the change."""
+        self._remove_module('selected', module_name)
 
     def set_selected_modules(self, modules):
-        # Convert the Python list to a JSON string
-        self.selected_modules = json.dumps(modules)
+        """Replace selected_modules. The caller commits the change."""
+        self._set_modules('selected', modules)
 
+    ## ---------- RECOMMENDED MODULES METHODS ----------
     def get_recommended_modules(self):
-        # Convert the JSON string back to a Python list
-        return json.loads(self.recommended_modules)
+        """Retrieve recommended modules as a Python list."""
+        return self._get_modules('recommended')
 
     def set_recommended_modules(self, modules):
-        # Convert the Python list to a JSON string
-        self.recommended_modules = json.dumps(modules)
+        """Replace recommended_modules. The caller commits the change."""
+        self._set_modules('recommended', modules)
+
+    def add_recommended_module(self, module_name):
+        """Add a module to recommended_modules; False if no module has that name. The caller commits the change."""
+        return self._add_module('recommended', module_name)
+
+    def remove_recommended_module(self, module_name):
+        """Remove a module from recommended_modules. The caller commits the change."""
+        self._remove_module('recommended', module_name)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password_hash = _hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """
+        Verify a password against the stored hash.
+
+        Hashes from before the switch to Argon2id (Werkzeug's 'pbkdf2:sha256$...')
+        are still accepted. After a successful check, those and Argon2 hashes made
+        with older parameters are replaced with a current hash; the caller commits.
+        """
+        if not self.password_hash.startswith('$argon2'):
+            if not _verify_legacy_password(self.password_hash, password):
+                return False
+            self.set_password(password)
+            return True
+
+        try:
+            _verify_password(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+        if password_hasher.check_needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
     
     # Define the 'is_active' property (since Flask-Login requires it)
     @property
@@ -92,63 +424,41 @@ class User(UserMixin, db.Model):
     ## ---------- SAVED MODULES METHODS ----------
     def get_saved_modules(self):
         """Retrieve saved modules as a Python list."""
-        return json.loads(self.saved_modules) if self.saved_modules else []
+        return self._get_modules('saved')
 
     def add_saved_module(self, module_name):
-        """Add a module to saved_modules and update the database."""
-        modules = self.get_saved_modules()
-        if module_name not in modules:
-            modules.append(module_name)
-            self.saved_modules = json.dumps(modules)
-            db.session.commit()
+        """Add a module to saved_modules; False if no module has that name. The caller commits the change."""
+        return self._add_module('saved', module_name)
 
     def remove_saved_module(self, module_name):
-        """Remove a module from saved_modules and update the database."""
-        modules = self.get_saved_modules()
-        if module_name in modules:
-            modules.remove(module_name)
-            self.saved_modules = json.dumps(modules)
-            db.session.commit()
+        """Remove a module from saved_modules. The caller commits the change."""
+        self._remove_module('saved', module_name)
+
+    def count_saved_modules(self):
+        """Return the number of saved modules."""
+        return self._count_modules('saved')
 
     ## ---------- TAUGHT MODULES METHODS ----------
     def get_taught_modules(self):
         """Retrieve taught modules as a Python list."""
-        return json.loads(self.taught_modules) if self.taught_modules else []
+        return self._get_modules('taught')
 
     def add_taught_module(self, module_name):
-        """Add a module to taught_modules and update the database."""
-        modules = self.get_taught_modules()
-        if module_name not in modules:
-            modules.append(module_name)
-            self.taught_modules = json.dumps(modules)
-            db.session.commit()
+        """Add a module to taught_modules; False if no module has that name. The caller commits the change."""
+        return self._add_module('taught', module_name)
 
     def remove_taught_module(self, module_name):
-        """Remove a module from taught_modules and update the database."""
-        modules = self.get_taught_modules()
-        if module_name in modules:
-            modules.remove(module_name)
-            self.taught_modules = json.dumps(modules)
-            db.session.commit()
+        """Remove a module from taught_modules. The caller commits the change."""
+        self._remove_module('taught', module_name)
 
-    def add_recommended_module(self, module_name):
-        """Add a module to recommended_modules and update the database."""
-        modules = self.get_recommended_modules()
-        if module_name not in modules:
-            modules.append(module_name)
-            self.recommended_modules = json.dumps(modules)
-            db.session.commit()
+    def count_taught_modules(self):
+        """Return the number of taught modules."""
+        return self._count_modules('taught')
 
-    def remove_recommended_module(self, module_name):
-        """Remove a module from recommended_modules and update the database."""
-        modules = self.get_recommended_modules()
-        if module_name in modules:
-            modules.remove(module_name)
-            self.recommended_modules = json.dumps(modules)
-            db.session.commit()
-
-    # Establishing the relationship with back_populates
-    modules = relationship('Module', secondary='user_modules', back_populates='users')
+    # Establishing the relationship with back_populates.
+    # Read-only: every module on any of the user's lists (rows are written through
+    # the methods above, which also set UserModules.kind).
+    modules = relationship('Module', secondary='user_modules', back_populates='users', viewonly=True)
 
 class Module(db.Model):
     """
@@ -157,22 +467,55 @@ class Module(db.Model):
     Contains details about the module, including aggregated review data,
     summaries, and generated feedback.
     """
+    # Modules are looked up by name (module lists, topics, recommendations) and
+    # listed by category. Names are unique; the constraint's index serves the
+    # name lookups, and add_module relies on it to reject duplicates.
+    __table_args__ = (
+        db.UniqueConstraint('name', name='uq_module_name'),
+        db.Index('ix_module_category', 'category'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
     outlook = db.Column(db.String(255))
     summary = db.Column(db.String(700))
-    positive_reviews = db.Column(db.Integer)
-    negative_reviews = db.Column(db.Integer)
-    positive_emotions = db.Column(db.Integer)
-    negative_emotions = db.Column(db.Integer)
+    # Review and emotion figures are whole percentages (0-100).
+    positive_reviews = db.Column(db.SmallInteger)
+    negative_reviews = db.Column(db.SmallInteger)
+    positive_emotions = db.Column(db.SmallInteger)
+    negative_emotions = db.Column(db.SmallInteger)
     category = db.Column(db.String(100))
-    teacher_prompt = db.Column(db.String(700))
-    teacher_feedback_recommendation = db.Column(db.String(2000))
-    teacher_feedback_recommendation_shortform = db.Column(db.String(2000))
-    topics = db.Column(db.Text, default="[]")  # JSON string for topics
+    # The generated prompt and feedback texts are long (the feedback runs to
+    # hundreds of KB for some modules) and most queries don't need them, so they
+    # are left out of the default SELECT and loaded on first access. Queries that
+    # return the feedback undefer the 'teacher_feedback' group up front.
+    teacher_prompt = deferred(db.Column(db.Text))
+    teacher_feedback_recommendation = deferred(db.Column(db.Text), group='teacher_feedback')
+    teacher_feedback_recommendation_shortform = deferred(db.Column(db.Text), group='teacher_feedback')
+    topics = db.Column(JSONList, default=list)  # List of topic names
+    similar_modules = db.Column(JSONList, default=list)  # List of similar module names
     analysis_refs = db.Column(db.String(100))
 
-    users = relationship('User', secondary='user_modules', back_populates='modules', overlaps="modules")
+    users = relationship('User', secondary='user_modules', back_populates='modules', viewonly=True)
+
+    @classmethod
+    def bulk_insert(cls, rows, batch_size=BULK_INSERT_BATCH_SIZE):
+        """Insert module rows given as dicts, in batches. The caller commits."""
+        _bulk_insert(cls, rows, batch_size)
+
+    @classmethod
+    def bulk_upsert(cls, rows, batch_size=BULK_INSERT_BATCH_SIZE):
+        """
+        Insert module rows given as dicts, in batches.
+
+        A row whose name already exists updates that module instead, so its id,
+        and with it every user's list entries for the module, is kept. Each name
+        may appear only once in `rows` (PostgreSQL rejects a statement that
+        updates the same row twice). The caller commits.
+        """
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        if columns:
+            _bulk_insert(cls, rows, batch_size, stmt=_upsert(cls, 'name', columns))
 
     def get_name(self):
         """Retrieve the title of the module."""
@@ -200,11 +543,11 @@ class Module(db.Model):
 
     def get_similar_modules(self):
         """Retrieve similar modules as a Python list."""
-        return json.loads(self.similar_modules) if self.similar_modules else []
+        return self.similar_modules
 
     def get_topics(self):
         """Retrieve topics as a Python list."""
-        return json.loads(self.topics) if self.topics else []
+        return self.topics
 
 class TopicByModule(db.Model):
     """
@@ -212,14 +555,30 @@ class TopicByModule(db.Model):
 
     This model stores aggregated data (reviews, emotions, summaries) specifically
     related to individual topics, likely derived from analysis of feedback mentioning those topics.
+
+    Rows are looked up by module name and topic, which the (name, topic) index
+    serves. `module_id` links the row to its Module; it is empty for topic rows
+    whose module is not in the module table.
     """
+    __table_args__ = (
+        db.Index('ix_topic_by_module_name_topic', 'name', 'topic'),
+        db.Index('ix_topic_by_module_module_id_topic', 'module_id', 'topic'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
+    module_id = db.Column(db.Integer, db.ForeignKey('module.id', name='fk_topic_by_module_module_id_module'))
     name = db.Column(db.String(255), nullable=False)
     topic = db.Column(db.String(255), nullable=False)
     topic_outlook = db.Column(db.String(255))
     topic_summary = db.Column(db.String(700))
-    positive_reviews_topic = db.Column(db.Integer)
-    negative_reviews_topic = db.Column(db.Integer)
-    positive_emotions_topic = db.Column(db.Integer)
-    negative_emotions_topic = db.Column(db.Integer)
+    # Whole percentages (0-100), like the Module figures.
+    positive_reviews_topic = db.Column(db.SmallInteger)
+    negative_reviews_topic = db.Column(db.SmallInteger)
+    positive_emotions_topic = db.Column(db.SmallInteger)
+    negative_emotions_topic = db.Column(db.SmallInteger)
     analysis_ref_topic = db.Column(db.String(100))
+
+    @classmethod
+    def bulk_insert(cls, rows, batch_size=BULK_INSERT_BATCH_SIZE):
+        """Insert topic rows given as dicts, in batches. The caller commits."""
+        _bulk_insert(cls, rows, batch_size)
@@ -6,73 +6,179 @@ using pandas, processes the data (e.g., cleaning percentage values), and then
 populates the 'Module' and 'TopicByModule' tables in the database defined
 by the Flask application. It uses the existing Flask app context to interact
 with the SQLAlchemy database session.
+
+Run it as a script (`python populate_db.py`). Importing the module only
+defines the helpers; nothing is read or written until populate_database()
+is called inside an app context.
 """
 
-import json
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+from sqlalchemy import delete, select
 from database import db  # Import only db, no need to re-init
-from models import Module, TopicByModule
-from app import app  # Import the existing app instance
-
-# Function to clean percentage values and convert to integer
-def clean_percentage(value):
-    # Remove '%' and convert to float, then to integer
-    if isinstance(value, str):
-        value = value.replace('%', '')  # Remove the '%' symbol
-        try:
-            return int(float(value))  # Convert to float and then to int
-        except ValueError:
-            return 0  # If conversion fails, return 0
-    return 0  # If value is not a string, return 0
-
-# Load CSV files
-modules_df = pd.read_csv("./reviews_data_processing/data/mix_range_reviews2.csv")
-topics_df = pd.read_csv("./reviews_data_processing/data/topics_by_module.csv")
-
-print(modules_df.columns)
-print(topics_df.columns)
-
-with app.app_context():  # Use the existing app context
-    # Clear existing data to avoid duplicates
-    db.session.query(Module).delete()
-    db.session.query(TopicByModule).delete()
-    db.session.commit()
+from cache import cache  # Shared response cache, cleared after the reload
+from models import Module, TopicByModule, UserModules
+from app import create_app  # Application factory
 
-    # Populate Module table
-    for _, row in modules_df.iterrows():
-        module = Module(
-            name=row["module_name"],
-            outlook=row["outlook"],
-            summary=row["summary"],
-            positive_reviews=clean_percentage(row.get("positive_reviews", "0%")),  # Use .get() to avoid KeyError
-            negative_reviews=clean_percentage(row.get("negative_reviews", "0%")),
-            positive_emotions=clean_percentage(row.get("positive_emotions", "0%")),
-            negative_emotions=clean_percentage(row.get("negative_emotions", "0%")),
-            category=row["category"],
-            teacher_prompt=row["teacher_feedback_prompt"],
-            teacher_feedback_recommendation=row["teacher_feedback_recommendation"],
-            teacher_feedback_recommendation_shortform=row["shortened_feedback"],
-            topics=json.dumps(row["topics"].split(",")),  # Convert topics to JSON string
-            analysis_refs=row["analysis_refs"]
-        )
+# The review/emotion percentage columns, named as in the module CSV. The topic
+# CSV may use these names or the same names with a "_topic" suffix.
+PERCENTAGE_COLUMNS = ["positive_reviews", "negative_reviews", "positive_emotions", "negative_emotions"]
+
+# CSV column -> Module attribute, for the columns that are loaded
+MODULE_COLUMNS = {
+    "module_name": "name",
+    "outlook": "outlook",
+    "summary": "summary",
+    "positive_reviews": "positive_reviews",
+    "negative_reviews": "negative_reviews",
+    "positive_emotions": "positive_emotions",
+    "negative_emotions": "negative_emotions",
+    "category": "category",
+    "teacher_feedback_prompt": "teacher_prompt",
+    "teacher_feedback_recommendation": "teacher_feedback_recommendation",
+    "shortened_feedback": "teacher_feedback_recommendation_shortform",
+    "topics": "topics",
+    "analysis_refs": "analysis_refs",
+}
+
+# CSV column -> TopicByModule attribute (the percentage columns are the cleaned ones)
+TOPIC_COLUMNS = {
+    "module_name": "name",
+    "topic": "topic",
+    "topic_outlook": "topic_outlook",
+    "topic_summary": "topic_summary",
+    "positive_reviews_topic": "positive_reviews_topic",
+    "negative_reviews_topic": "negative_reviews_topic",
+    "positive_emotions_topic": "positive_emotions_topic",
+    "negative_emotions_topic": "negative_emotions_topic",
+    "analysis_refs": "analysis_ref_topic",
+}
+
+# Percentages as they appear in the CSVs ("0%" to "100%"), mapped to their values
+PERCENTAGE_VALUES = {f"{i}%": i for i in range(101)}
 
-        db.session.add(module)
-
-    # Populate TopicByModule table
-    for _, row in topics_df.iterrows():
-        topic = TopicByModule(
-            name=row["module_name"],
-            topic=row["topic"],
-            topic_outlook=row["topic_outlook"],
-            topic_summary=row["topic_summary"],
-            positive_reviews_topic=clean_percentage(row.get("positive_reviews_topic", row.get("positive_reviews", "0%"))),
-            negative_reviews_topic=clean_percentage(row.get("negative_reviews_topic", row.get("negative_reviews", "0%"))),
-            positive_emotions_topic=clean_percentage(row.get("positive_emotions_topic", row.get("positive_emotions", "0%"))),
-            negative_emotions_topic=clean_percentage(row.get("negative_emotions_topic", row.get("negative_emotions", "0%"))),
-            analysis_ref_topic=row["analysis_refs"]
+# Function to clean a whole column of percentage values and convert them to integers
+def clean_percentages(values):
+    # Almost every cell is one of PERCENTAGE_VALUES, so look those up directly
+    numbers = values.map(PERCENTAGE_VALUES)
+    # Parse anything else ("99.0%", " 5 %") by removing '%' in one pass over
+    # those cells; anything that doesn't parse (blank, missing, text) becomes 0
+    unmatched = numbers.isna() & values.notna()
+    if unmatched.any():
+        numbers[unmatched] = pd.to_numeric(
+            values[unmatched].str.replace("%", "", regex=False).str.strip(),
+            errors="coerce",
         )
-        db.session.add(topic)
+    # Truncate to whole percentages, stored as int16 like the SMALLINT columns
+    return numbers.fillna(0).astype("int16")
+
+# Columns read from the topic CSV: the TOPIC_COLUMNS sources plus the plain
+# percentage columns, which some topic CSVs use instead of the "_topic" ones
+TOPIC_CSV_COLUMNS = set(TOPIC_COLUMNS) | set(PERCENTAGE_COLUMNS)
+
+# Rows parsed from a CSV at a time; memory use depends on this, not the file size
+CSV_CHUNK_SIZE = 20_000
+
+MODULES_CSV_PATH = "./reviews_data_processing/data/mix_range_reviews2.csv"
+TOPICS_CSV_PATH = "./reviews_data_processing/data/topics_by_module.csv"
+
+# Function to read a CSV in chunks of CSV_CHUNK_SIZE rows
+def read_csv_chunks(path, columns):
+    # Only the loaded columns are parsed, and every value is read as text
+    # (percentages are cleaned separately), so pandas skips type inference
+    return pd.read_csv(
+        path,
+        usecols=lambda column: column in columns,
+        dtype=str,
+        engine="c",
+        chunksize=CSV_CHUNK_SIZE,
+    )
+
+# Function to read ahead one chunk: the next chunk is parsed in a worker thread
+# while the caller cleans and inserts the current one. pandas' C parser and the
+# database driver both release the GIL, so the two overlap, and memory stays
+# bounded at two chunks.
+def prefetched(chunks):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, chunks, None)
+        while (chunk := future.result()) is not None:
+            future = executor.submit(next, chunks, None)
+            yield chunk
 
-    # Commit all changes
+# Function to turn a chunk of the module CSV into Module rows
+def module_rows(chunk):
+    # Module names are unique: if the CSV repeats one, its last row wins, as it
+    # would across chunks (each chunk's upsert updates the earlier row)
+    chunk = chunk.drop_duplicates(subset="module_name", keep="last").copy()
+    # Clean the percentage columns; a column missing from the CSV counts as 0%
+    for column in PERCENTAGE_COLUMNS:
+        chunk[column] = clean_percentages(chunk[column]) if column in chunk else 0
+    # Topics are stored as a JSON list (Module.topics encodes it with orjson).
+    # Many modules share the same topics string, so each distinct string is
+    # split once and the rows reuse the list; a blank topics cell becomes [].
+    topic_lists = {value: value.split(",") for value in chunk["topics"].dropna().unique()}
+    chunk["topics"] = [topic_lists.get(value, []) for value in chunk["topics"]]
+    return chunk[list(MODULE_COLUMNS)].rename(columns=MODULE_COLUMNS).to_dict(orient="records")
+
+# Function to turn a chunk of the topic CSV into TopicByModule rows
+def topic_rows(chunk, module_ids):
+    for column in PERCENTAGE_COLUMNS:
+        # Topic rows use the "_topic" column, falling back to the plain column
+        # where that is blank (or missing from the CSV)
+        values = chunk.get(f"{column}_topic")
+        if column in chunk:
+            values = chunk[column] if values is None else values.combine_first(chunk[column])
+        chunk[f"{column}_topic"] = clean_percentages(values) if values is not None else 0
+    rows = chunk[list(TOPIC_COLUMNS)].rename(columns=TOPIC_COLUMNS).to_dict(orient="records")
+    for row in rows:
+        row["module_id"] = module_ids.get(row["name"])  # None if the module isn't in the module CSV
+    return rows
+
+# Function to load the CSV data into the Module and TopicByModule tables
+def populate_database():
+    # Everything below runs in one transaction: if any step fails, nothing is
+    # committed and the previous data stays in place.
+
+    # Topic rows are replaced wholesale. This is a plain table DELETE: there are
+    # no loaded objects for the session to synchronise.
+    db.session.execute(TopicByModule.__table__.delete())
+
+    # Insert or update the Module rows in bulk, one CSV chunk at a time. Modules
+    # are matched by their unique name, so an existing module keeps its id and
+    # the users' lists (user_modules rows referencing module.id) stay intact.
+    csv_names = set()
+    for chunk in prefetched(read_csv_chunks(MODULES_CSV_PATH, MODULE_COLUMNS)):
+        rows = module_rows(chunk)
+        csv_names.update(row["name"] for row in rows)
+        Module.bulk_upsert(rows)
+
+    # Map module names to their ids, for the topic rows, and find the modules
+    # that are no longer in the CSV
+    module_ids = dict(db.session.execute(select(Module.name, Module.id)).all())
+    removed_ids = [module_id for name, module_id in module_ids.items() if name not in csv_names]
+
+    # Delete those modules. Their entries on users' lists go first, as they
+    # reference the modules (the DELETE would fail on that foreign key
+    # otherwise, or leave dangling rows where it isn't enforced)
+    if removed_ids:
+        db.session.execute(delete(UserModules).where(UserModules.module_id.in_(removed_ids)))
+        db.session.execute(delete(Module).where(Module.id.in_(removed_ids)))
+
+    # Insert the TopicByModule rows the same way
+    for chunk in prefetched(read_csv_chunks(TOPICS_CSV_PATH, TOPIC_CSV_COLUMNS)):
+        TopicByModule.bulk_insert(topic_rows(chunk, module_ids))
+
+    # Commit the new data in one go
     db.session.commit()
-    print("Database populated successfully!")
\ No newline at end of file
+
+    # Module data changed, so drop cached catalog responses. This reaches the
+    # server's workers through a shared Redis cache (CACHE_REDIS_URL); an
+    # in-memory cache belongs to each server process and expires on its own.
+    cache.clear()
+    print("Database populated successfully!")
+
+
+if __name__ == "__main__":
+    app = create_app()  # Build the app to get its configuration and database binding
+    with app.app_context():  # Use the app's context
+        populate_database()
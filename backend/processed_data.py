@@ -15,38 +15,41 @@ import json
 from database import db
 from models import Module
 import csv
+from itertools import islice
+import pandas as pd
+from populate_db import clean_percentages  # Same "85%" -> 85 parsing as the pandas seeding
 
 def populate_module_table():
     """
     Populates the Module table from a predefined JSON file ('modules_data.json').
 
-    Reads module data from the JSON file, creates Module model instances,
-    and commits them to the database in a single transaction. Includes basic
-    error handling with rollback on failure.
+    Reads module data from the JSON file, bulk inserts it into the Module
+    table and commits it in a single transaction. Includes basic error
+    handling with rollback on failure.
 
     Raises:
         FileNotFoundError: If 'modules_data.json' does not exist.
         json.JSONDecodeError: If 'modules_data.json' contains invalid JSON.
-        Exception: Catches potential database errors during commit.
+        Exception: Catches potential database errors during the insert or commit.
     """
     # Load JSON file
     with open('modules_data.json') as file:
         modules = json.load(file)
 
-    for module_data in modules:
-        # Create Module instance
-        module = Module(
-            title=module_data['title'],
-            outlook=module_data['outlook'],
-            positive_reviews=module_data['positive_reviews'],
-            negative_reviews=module_data['negative_reviews'],
-            category=module_data['category'],
-            teacher_feedback_recommendation=module_data['teacher_feedback_recommendation'],
-            similar_modules=module_data['similar_modules']
-        )
-        db.session.add(module)
-
     try:
+        # Insert the modules as plain dicts, with no ORM instances to track or flush
+        Module.bulk_insert(
+            {
+                'name': module_data['title'],  # The JSON calls the module name its title
+                'outlook': module_data['outlook'],
+                'positive_reviews': module_data['positive_reviews'],
+                'negative_reviews': module_data['negative_reviews'],
+                'category': module_data['category'],
+                'teacher_feedback_recommendation': module_data['teacher_feedback_recommendation'],
+                'similar_modules': module_data['similar_modules'],
+            }
+            for module_data in modules
+        )
         db.session.commit()
         print("Modules populated successfully!")
     except Exception as e:
@@ -54,37 +57,62 @@ def populate_module_table():
         print("Error populating modules:", str(e))
 
 # or if using a csv (maybe easy to just make a summary table/df)
+# Rows read from the CSV per INSERT/commit in populate_from_csv
+CSV_BATCH_SIZE = 5000
+
+def module_rows_from_csv(batch):
+    """
+    Converts a batch of CSV rows (dicts from DictReader) into Module row dicts.
+
+    The review columns hold percentages such as "85%", so they are parsed with
+    clean_percentages, one column per batch; missing or unparsable values
+    become 0.
+    """
+    reviews = {
+        column: clean_percentages(pd.Series([row.get(column) for row in batch], dtype=object))
+        for column in ('positive_reviews', 'negative_reviews')
+    }
+    return [
+        {
+            'name': row['title'],  # The CSV calls the module name its title
+            'outlook': row.get('outlook'),
+            'positive_reviews': int(reviews['positive_reviews'].iat[i]),
+            'negative_reviews': int(reviews['negative_reviews'].iat[i]),
+            'category': row.get('category'),
+            'teacher_feedback_recommendation': row.get('teacher_feedback_recommendation'),
+            'similar_modules': row.get('similar_modules', '[]').split(';'),
+            'topics': row.get('topics', '[]').split(';'),
+        }
+        for i, row in enumerate(batch)
+    ]
+
 def populate_from_csv(csv_file):
     """
     Populates the Module table from a specified CSV file.
 
-    Reads module data row by row from the CSV file using DictReader,
-    creates Module model instances, and commits them to the database.
-    Handles potential missing columns using .get() and performs basic
-    type conversions and JSON serialization for list-like fields.
+    Streams module data row by row from the CSV file using DictReader and
+    inserts it in batches of CSV_BATCH_SIZE rows, committing after each batch,
+    so memory use depends on the batch size rather than the file size. Handles
+    potential missing columns using .get(), parses the review percentages
+    ("85%") and splits list-like fields into lists.
 
     Args:
         csv_file (str): The file path to the CSV file containing module data.
 
     Raises:
         FileNotFoundError: If the specified csv_file does not exist.
-        Exception: Catches potential database errors during commit.
+        Exception: Catches potential database errors during the insert or commit.
 
-    NOTE: Commits changes after processing all rows. For very large CSV files,
-          consider committing in batches to manage memory usage and transaction size.
+    NOTE: On an error the failed batch is rolled back, but batches committed
+    before it stay in the database, so the table is left partially loaded.
     """
     with open(csv_file, newline='') as file:
         reader = csv.DictReader(file)
-        for row in reader:
-            module = Module(
-                title=row['title'],
-                outlook=row.get('outlook'),
-                positive_reviews=int(row.get('positive_reviews', 0)),
-                negative_reviews=int(row.get('negative_reviews', 0)),
-                category=row.get('category'),
-                teacher_feedback_recommendation=row.get('teacher_feedback_recommendation'),
-                similar_modules=json.dumps(row.get('similar_modules', '[]').split(';')),
-                topics=json.dumps(row.get('topics', '[]').split(';'))
-            )
-            db.session.add(module)
-        db.session.commit()
\ No newline at end of file
+        try:
+            while batch := list(islice(reader, CSV_BATCH_SIZE)):
+                Module.bulk_insert(module_rows_from_csv(batch))
+                db.session.commit()
+            print("Modules populated successfully!")
+        except Exception as e:
+            db.session.rollback()
+            print("Error populating modules:", str(e))
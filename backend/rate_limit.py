@@ -0,0 +1,52 @@
+"""
+Rate limiting module.
+
+This module sets up the Flask-Limiter instance used to throttle the login and
+registration endpoints, and provides a function to bind it to the Flask
+application. Each of those requests hashes a password, which deliberately costs
+about 0.15 s of CPU and 64 MiB of memory, so without a limit a single client
+could keep every worker busy (or guess passwords) as fast as it can send requests.
+"""
+
+import os
+
+from flask import jsonify, request
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+
+# Create a global limiter instance.
+# Blueprints import it to decorate endpoints with `@limiter.limit(...)`. Limits
+# are per client IP address unless an endpoint passes its own key function.
+# It's initialized without an app here, and bound to the Flask app later in `init_limiter`.
+limiter = Limiter(key_func=get_remote_address)
+
+def remote_address_and_email():
+    """
+    Rate limit key: the client IP address plus the email in the JSON body.
+
+    Used for login, so repeated attempts on one account are throttled without
+    locking out other users behind the same address (e.g. a campus network).
+    """
+    data = request.get_json(silent=True)
+    email = data.get('email') if isinstance(data, dict) else None
+    return f"{get_remote_address()}:{email or ''}"
+
+def rate_limit_exceeded(error):
+    """Answer a request over its limit with a JSON 429 in the same shape as the auth errors."""
+    return jsonify({'success': False, 'message': 'Too many attempts. Please try again later.'}), 429
+
+def init_limiter(app):
+    """
+    Configure and bind the limiter to the Flask application.
+
+    Uses Redis when RATELIMIT_REDIS_URL is set, so all worker processes share the
+    counters; otherwise each process counts on its own, in memory.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    app.config.setdefault('RATELIMIT_STORAGE_URI', os.environ.get('RATELIMIT_REDIS_URL', 'memory://'))
+    # Scope keys so they don't collide with other applications using the same Redis.
+    app.config.setdefault('RATELIMIT_KEY_PREFIX', 'module_insight')
+    limiter.init_app(app)
+    app.register_error_handler(429, rate_limit_exceeded)
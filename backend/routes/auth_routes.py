@@ -6,15 +6,27 @@ It uses Flask-Login for session management and interacts with the User model
 and the database session.
 """
 
+# Standard library imports
+import logging
+
 # Third-party imports
 from flask import Blueprint, request, jsonify # Core Flask components for routing, request handling, and JSON responses
 from flask_login import login_user, logout_user, current_user # Functions for user session management
-from models import User # The User database model
+from models import User, check_dummy_password # The User database model and the unknown-user password check
 from database import db # The SQLAlchemy database instance
+from rate_limit import limiter, remote_address_and_email # Rate limits for the password-hashing endpoints
+from schemas import RegisterRequest, LoginRequest # Validated JSON bodies for register and login
+from pydantic import ValidationError # Raised when a request body doesn't match its schema
+from sqlalchemy import lambda_stmt, select, update # SQLAlchemy 2.0-style query construction
+from sqlalchemy.exc import IntegrityError # Raised when an insert violates a unique constraint
+from sqlalchemy.orm import undefer # Loads a deferred column up front
 
 auth_bp = Blueprint('auth', __name__)
 
+logger = logging.getLogger(__name__)
+
 @auth_bp.route('/register', methods=['POST'])
+@limiter.limit("10/minute;50/hour")  # Per client IP address
 def register():
     """
     Handle user registration requests.
@@ -29,24 +41,34 @@ def register():
         on success, or an error message on failure.
         Status Codes:
         - 200: Registration and login successful.
-        - 400: Missing required fields or user already exists.
+        - 400: Missing required fields, malformed email, unknown role or user already exists.
+        - 429: Too many registrations from this address.
         - 500: Internal server error during processing.
     """
     try:
-        # Extract data from the request
-        data = request.get_json()
-        email = data.get('email')
-        password = data.get('password')
-        name = data.get('name')
-        role = data.get('role')
-        year = data.get('year') if role == 'Student' else None
-
-        # Validate if the required fields are present
-        if not email or not password or not name or not role:
-            return jsonify({'success': False, 'message': 'Missing required fields.'}), 400
-
-        # Check if the email already exists
-        if User.query.filter_by(email=email).first():
+        # Parse and validate the request body in one pass
+        try:
+            data = RegisterRequest.model_validate_json(request.get_data())
+        except ValidationError as e:
+            # Report a malformed email or an unknown role on its own; anything else
+            # is a missing field
+            problems = {(error['loc'], error['type']) for error in e.errors()}
+            if problems == {(('email',), 'string_pattern_mismatch')}:
+                message = 'Invalid email address.'
+            elif problems == {(('role',), 'literal_error')}:
+                message = 'Invalid role.'
+            else:
+                message = 'Missing required fields.'
+            return jsonify({'success': False, 'message': message}), 400
+        email = data.email
+        password = data.password
+        name = data.name
+        role = data.role
+        year = data.year if role == 'Student' else None
+
+        # Check if the email already exists, before spending time hashing the password.
+        # The unique constraint on User.email is what actually guarantees it (see below).
+        if db.session.scalar(select(select(User.id).filter_by(email=email).exists())):
             return jsonify({'success': False, 'message': 'User already exists.'}), 400
 
         # Create new user instance
@@ -54,11 +76,17 @@ def register():
         new_user.set_password(password)
 
         # Log the user creation process
-        print(f"Creating new user: {new_user}")
-        
-        # Add the new user to the session and commit to the database
+        logger.info("Creating new user: %s", email)
+
+        # Add the new user to the session and commit to the database. If another
+        # request registered the same email since the check above, the unique
+        # constraint rejects this insert.
         db.session.add(new_user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'success': False, 'message': 'User already exists.'}), 400
 
         # Automatically log in the new user
         login_user(new_user)  # Log in the user after successful registration
@@ -78,10 +106,12 @@ def register():
 
     except Exception as e:
         # Log the error
-        print(f"Error during registration: {e}")
+        logger.exception("Error during registration: %s", e)
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @auth_bp.route('/login', methods=['POST'])
+@limiter.limit("5/minute;30/hour", key_func=remote_address_and_email)  # Per address and account
+@limiter.limit("60/minute")  # Per client IP address, across all accounts
 def login_user_endpoint():
     """
     Handle user login requests.
@@ -97,23 +127,34 @@ def login_user_endpoint():
         - 200: Login successful.
         - 400: Missing email or password in the request.
         - 401: Invalid email or password.
+        - 429: Too many login attempts.
         - 500: Internal server error during processing.
     """
     try:
-        # Extract data from the request
-        data = request.get_json()
-        email = data.get('email')
-        password = data.get('password')
-
-        # Validate if email and password are provided
-        if not email or not password:
+        # Parse the request body; email and password are both required
+        try:
+            data = LoginRequest.model_validate_json(request.get_data())
+        except ValidationError:
             return jsonify({'success': False, 'message': 'Email and password are required.'}), 400
+        email = data.email
+        password = data.password
+
+        # Find the user by email, loading the deferred password hash in the same query.
+        # As a lambda statement the query is built and its cache key computed only
+        # once; later logins just bind the new email to the cached statement.
+        user = db.session.scalars(
+            lambda_stmt(lambda: select(User).where(User.email == email).options(undefer(User.password_hash)))
+        ).first()
+
+        # Check if user exists and password is correct.
+        # An unknown email is checked against a dummy hash so it takes as long
+        # as a wrong password and the timing doesn't reveal registered emails.
+        password_ok = user.check_password(password) if user else check_dummy_password(password)
+        if user and password_ok:
+            # Save the upgraded hash if check_password rehashed the password
+            if db.session.is_modified(user):
+                db.session.commit()
 
-        # Find the user by email
-        user = User.query.filter_by(email=email).first()
-
-        # Check if user exists and password is correct
-        if user and user.check_password(password):
             # Log the user in using Flask-Login
             login_user(user)
 
@@ -176,15 +217,23 @@ def update_user():
     if not email:
         return jsonify({"message": "Institution email is required."}), 400
 
-    user = User.query.filter_by(email=email).first()  # Query by email
-
-    if not user:
+    # Only the fields that were given are changed
+    values = {}
+    if name:
+        values['name'] = name
+    if year_of_study:
+        values['year'] = year_of_study
+
+    if values:
+        # Update the row in a single UPDATE, without loading the user first
+        result = db.session.execute(update(User).where(User.email == email).values(**values))
+        found = result.rowcount > 0
+    else:
+        found = db.session.scalar(select(select(User.id).filter_by(email=email).exists()))
+
+    if not found:
         return jsonify({"message": "User not found."}), 404
 
-    # Update user details with the provided data
-    user.name = name if name else user.name
-    user.year = year_of_study if year_of_study else user.year
-
     db.session.commit()
 
     return jsonify({"message": "User details have been updated successfully."}), 200
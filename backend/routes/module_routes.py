@@ -6,26 +6,37 @@ academic modules, as well as user-specific module lists (saved, taught, selected
 It interacts with the Module, User, and TopicByModule models and the database session.
 """
 
+# Standard library imports
+import logging
+
 # Third-party imports
 from flask import Blueprint, jsonify, request
-from models import Module, User, db, TopicByModule # Database models and the db session instance
+from models import Module, User, db, TopicByModule, _insert_unless_duplicate # Database models, the db session instance and the duplicate-skipping INSERT
 from flask_login import login_required, current_user # gives access to the current User instance to use the defined func
-import json
+from cache import cache, cache_success_only, conditional_response, with_etag # Shared response cache and ETags for read-mostly endpoints
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+import orjson # Re-encodes topic lists as the JSON text the frontend expects
 
 # Create a Blueprint instance named 'module'.
 # Routes defined with this blueprint will be prefixed (e.g., /modules) when registered in the main app.
 module_bp = Blueprint('module', __name__)
 
+# Answer repeat catalog requests (responses tagged by @with_etag) with 304 Not Modified
+module_bp.after_request(conditional_response)
+
+logger = logging.getLogger(__name__)
+
 # Route to get a specific module by title
 @module_bp.route('/<string:module_title>', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_module_by_title(module_title):
     """
     Retrieve details of a specific module by its title.
 
-    Searches the database for a module matching the provided title.
-    Note: The model seems to use 'name' internally, but the route uses 'title'.
-          Ensure consistency or adjust the query/model. This implementation
-          assumes the model field is actually `name`.
+    Searches the database for a module whose name matches the provided title
+    (modules are identified by name; there is no separate title column).
 
     Args:
         module_title (str): The title (name) of the module passed in the URL.
@@ -36,19 +47,19 @@ def get_module_by_title(module_title):
         - 200: Module found and details returned.
         - 404: Module with the specified title not found.
     """
-    module = Module.query.filter_by(title=module_title).first()
+    module = db.session.scalars(select(Module).filter_by(name=module_title).options(undefer(Module.teacher_feedback_recommendation))).first()
     if not module:
         return jsonify({"error": "Module not found"}), 404
     
     return jsonify({
         "id": module.id,
-        "title": module.title,
+        "title": module.name,
         "outlook": module.outlook,
         "positive_reviews": module.positive_reviews,
         "negative_reviews": module.negative_reviews,
         "category": module.category,
         "teacher_feedback_recommendation": module.teacher_feedback_recommendation,
-        "similar_modules": module.similar_modules.split(",")
+        "similar_modules": module.get_similar_modules()
     }), 200
 
 # Route to save or update a module (if required)
@@ -57,8 +68,9 @@ def add_module():
     """
     Add a new module to the database.
 
-    Expects a JSON payload with module details. Validates required fields
-    and checks if a module with the same title already exists before creating.
+    Expects a JSON payload with module details. Validates required fields,
+    then inserts the module unless one with the same title already exists
+    (enforced by the unique constraint on module names).
 
     Request Body (JSON):
         {
@@ -68,7 +80,7 @@ def add_module():
             "negative_reviews": %,
             "category": "...",
             "teacher_feedback_recommendation": "...",
-            "similar_modules": ["Module A", "Module B"] // Or comma-separated string?
+            "similar_modules": ["Module A", "Module B"]
         }
 
     Returns:
@@ -85,29 +97,31 @@ def add_module():
     if not all(field in data for field in required_fields):
         return jsonify({"error": "Missing required fields"}), 400
     
-    # Check if module already exists
-    existing_module = Module.query.filter_by(title=data['title']).first()
-    if existing_module:
+    # Insert the module; the unique constraint on name makes the database
+    # skip it if a module with this title already exists, without a SELECT first
+    inserted = _insert_unless_duplicate(Module, {
+        "name": data['title'],
+        "outlook": data['outlook'],
+        "positive_reviews": data['positive_reviews'],
+        "negative_reviews": data['negative_reviews'],
+        "category": data['category'],
+        "teacher_feedback_recommendation": data['teacher_feedback_recommendation'],
+        "similar_modules": data['similar_modules']
+    })
+    if not inserted:
+        db.session.rollback()
         return jsonify({"error": "Module already exists"}), 400
-    
-    # Create and save the new module
-    new_module = Module(
-        title=data['title'],
-        outlook=data['outlook'],
-        positive_reviews=data['positive_reviews'],
-        negative_reviews=data['negative_reviews'],
-        category=data['category'],
-        teacher_feedback_recommendation=data['teacher_feedback_recommendation'],
-        similar_modules=",".join(data['similar_modules'])
-    )
-    
-    db.session.add(new_module)
     db.session.commit()
+
+    # Module data changed, so drop cached catalog responses
+    cache.clear()
     
     return jsonify({"message": "Module added successfully"}), 201
 
 # Route to get module summary by category
 @module_bp.route('/category/<string:category>', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_module_by_category(category):
     """
     Retrieve a list of modules belonging to a specific category.
@@ -123,22 +137,35 @@ def get_module_by_category(category):
         - 200: Modules found and details returned.
         - 404: No modules found for the specified category.
     """
-    modules = Module.query.filter_by(category=category).all()
-    if not modules:
+    # Select just the returned columns: the rows come back as tuples, without
+    # building a Module object for each one
+    rows = db.session.execute(
+        select(
+            Module.id,
+            Module.name,
+            Module.outlook,
+            Module.positive_reviews,
+            Module.negative_reviews,
+            Module.category,
+            Module.teacher_feedback_recommendation,
+            Module.similar_modules,
+        ).filter_by(category=category)
+    ).all()
+    if not rows:
         return jsonify({"error": "No modules found for this category"}), 404
     
     module_data = [
         {
-            "id": module.id,
-            "title": module.title,
-            "outlook": module.outlook,
-            "positive_reviews": module.positive_reviews,
-            "negative_reviews": module.negative_reviews,
-            "category": module.category,
-            "teacher_feedback_recommendation": module.teacher_feedback_recommendation,
-            "similar_modules": module.similar_modules.split(",")
+            "id": row.id,
+            "title": row.name,  # Modules are identified by name; there is no separate title column
+            "outlook": row.outlook,
+            "positive_reviews": row.positive_reviews,
+            "negative_reviews": row.negative_reviews,
+            "category": row.category,
+            "teacher_feedback_recommendation": row.teacher_feedback_recommendation,
+            "similar_modules": row.similar_modules
         }
-        for module in modules
+        for row in rows
     ]
     return jsonify(module_data), 200
 
@@ -162,8 +189,8 @@ def get_saved_modules():
     """Get the list of saved modules for the logged-in user."""
     saved_modules = current_user.get_saved_modules()
     
-    # Print for debugging
-    print(f"Saved Modules for {current_user.email}: {saved_modules} (Type: {type(saved_modules)})")
+    # Debugging log (only written when DEBUG logging is enabled)
+    logger.debug("Saved Modules for %s: %s (Type: %s)", current_user.email, saved_modules, type(saved_modules))
     
     return jsonify({"saved_modules": saved_modules})  # Ensure it is a list
 
@@ -173,8 +200,8 @@ def get_saved_modules2():
     """Get the list of saved modules for the logged-in user."""
     saved_modules = current_user.get_saved_modules()
     
-    # Print for debugging
-    print(f"Saved Modules for {current_user.email}: {saved_modules} (Type: {type(saved_modules)})")
+    # Debugging log (only written when DEBUG logging is enabled)
+    logger.debug("Saved Modules for %s: %s (Type: %s)", current_user.email, saved_modules, type(saved_modules))
     
     return saved_modules # Ensure it is a list
 
@@ -198,6 +225,7 @@ def add_saved_module():
         Status Codes:
         - 200: Module added successfully.
         - 400: Module name not provided in the request.
+        - 404: No module with that name exists.
     """
     """Add a module to saved_modules."""
     data = request.json
@@ -206,7 +234,9 @@ def add_saved_module():
     if not module_name:
         return jsonify({"error": "Module name is required"}), 400
 
-    current_user.add_saved_module(module_name)
+    if not current_user.add_saved_module(module_name):
+        return jsonify({"error": "Module not found"}), 404
+    db.session.commit()
     return jsonify({"message": "Module added", "saved_modules": current_user.get_saved_modules()})
 
 
@@ -238,6 +268,7 @@ def remove_saved_module():
         return jsonify({"error": "Module name is required"}), 400
 
     current_user.remove_saved_module(module_name)
+    db.session.commit()
     return jsonify({"message": "Module removed", "saved_modules": current_user.get_saved_modules()})
 
 
@@ -258,10 +289,10 @@ def get_taught_modules():
         Status Codes:
         - 200: Successfully retrieved taught modules.
     """
-    taught_modules = json.loads(current_user.taught_modules) if current_user.taught_modules else []
+    taught_modules = current_user.get_taught_modules()
 
-    # Print for debugging
-    print(f"Taught Modules for {current_user.email}: {taught_modules} (Type: {type(taught_modules)})")
+    # Debugging log (only written when DEBUG logging is enabled)
+    logger.debug("Taught Modules for %s: %s (Type: %s)", current_user.email, taught_modules, type(taught_modules))
 
     return jsonify({"taught_modules": taught_modules})  # Ensure it is a list
 
@@ -285,6 +316,7 @@ def add_taught_module():
         Status Codes:
         - 200: Module added successfully.
         - 400: Module name not provided in the request.
+        - 404: No module with that name exists.
     """
     """Add a module to taught_modules."""
     data = request.json
@@ -293,7 +325,9 @@ def add_taught_module():
     if not module_name:
         return jsonify({"error": "Module name is required"}), 400
 
-    current_user.add_taught_module(module_name)
+    if not current_user.add_taught_module(module_name):
+        return jsonify({"error": "Module not found"}), 404
+    db.session.commit()
     return jsonify({"message": "Module added", "taught_modules": current_user.get_taught_modules()})
 
 
@@ -325,6 +359,7 @@ def remove_taught_module():
         return jsonify({"error": "Module name is required"}), 400
 
     current_user.remove_taught_module(module_name)
+    db.session.commit()
     return jsonify({"message": "Module removed", "taught_modules": current_user.get_taught_modules()})
 
 from flask import Response
@@ -335,7 +370,7 @@ def get_saved_modules_count():
     """
     Get the number of saved modules for the logged-in user.
 
-    Retrieves the list of saved modules and returns its length.
+    Counts the saved modules in the database and returns the number.
 
     Requires:
         User must be logged in.
@@ -346,12 +381,13 @@ def get_saved_modules_count():
         - 200: Count retrieved successfully.
     """
     """Get the number of saved modules for the logged-in user."""
-    saved_modules = current_user.get_saved_modules()
+    # Counted in the database; the names themselves aren't needed
+    count = current_user.count_saved_modules()
     
-    # Debugging log
-    print(f"Saved Modules Count for {current_user.email}: {len(saved_modules)}")
+    # Debugging log (only written when DEBUG logging is enabled)
+    logger.debug("Saved Modules Count for %s: %d", current_user.email, count)
 
-    return Response(str(len(saved_modules)), status=200, mimetype='text/plain')
+    return Response(str(count), status=200, mimetype='text/plain')
 
 @module_bp.route('/taught_modules/count', methods=['GET'])
 @login_required
@@ -359,7 +395,7 @@ def get_taught_modules_count():
     """
     Get the number of taught modules for the logged-in user.
 
-    Retrieves the list of taught modules and returns its length.
+    Counts the taught modules in the database and returns the number.
 
     Requires:
         User must be logged in.
@@ -369,52 +405,73 @@ def get_taught_modules_count():
         Status Codes:
         - 200: Count retrieved successfully.
     """
-    taught_modules = json.loads(current_user.taught_modules) if current_user.taught_modules else []
+    # Counted in the database; the names themselves aren't needed
+    count = current_user.count_taught_modules()
     
-    # Debugging log
-    print(f"Taught Modules Count for {current_user.email}: {len(taught_modules)}")
+    # Debugging log (only written when DEBUG logging is enabled)
+    logger.debug("Taught Modules Count for %s: %d", current_user.email, count)
 
-    return Response(str(len(taught_modules)), status=200, mimetype='text/plain')
+    return Response(str(count), status=200, mimetype='text/plain')
 
 # utility funcs for the fetching and displaying of module data
+# Each one selects just the column it returns, so no Module objects are built.
+# All are in id order, so the lists line up index for index (an index on the
+# column could otherwise return it in index order).
 @module_bp.route('/modules/titles', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_module_titles():
-    titles = [module.get_title() for module in Module.query.all()]
+    # Modules are identified by name; there is no separate title column
+    titles = db.session.scalars(select(Module.name).order_by(Module.id)).all()
     return jsonify(titles), 200
 
 @module_bp.route('/modules/outlooks', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_module_outlooks():
-    outlooks = [module.get_outlook() for module in Module.query.all()]
+    outlooks = db.session.scalars(select(Module.outlook).order_by(Module.id)).all()
     return jsonify(outlooks), 200
 
 @module_bp.route('/modules/positive_reviews', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_positive_reviews():
-    positive_reviews = [module.get_positive_reviews() for module in Module.query.all()]
+    positive_reviews = db.session.scalars(select(Module.positive_reviews).order_by(Module.id)).all()
     return jsonify(positive_reviews), 200
 
 @module_bp.route('/modules/negative_reviews', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_negative_reviews():
-    negative_reviews = [module.get_negative_reviews() for module in Module.query.all()]
+    negative_reviews = db.session.scalars(select(Module.negative_reviews).order_by(Module.id)).all()
     return jsonify(negative_reviews), 200
 
 @module_bp.route('/modules/categories', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_category():
-    category = [module.get_category() for module in Module.query.all()]
+    category = db.session.scalars(select(Module.category).order_by(Module.id)).all()
     return jsonify(category), 200
 
 @module_bp.route('/modules/teacher_feedback', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_teacher_feedback():
-    feedback = [module.get_teacher_feedback_recommendation() for module in Module.query.all()]
+    feedback = db.session.scalars(select(Module.teacher_feedback_recommendation).order_by(Module.id)).all()
     return jsonify(feedback), 200
 
 @module_bp.route('/modules/similar_modules', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_similar_modules():
-    similar = [module.get_similar_modules() for module in Module.query.all()]
+    similar = db.session.scalars(select(Module.similar_modules).order_by(Module.id)).all()
     return jsonify(similar), 200
 
 @module_bp.route('/modules/topics', methods=['GET'])
+@cache.cached(response_filter=cache_success_only)
+@with_etag
 def get_topics():
-    topics = [module.get_topics() for module in Module.query.all()]
+    topics = db.session.scalars(select(Module.topics).order_by(Module.id)).all()
     return jsonify(topics), 200
 
 @module_bp.route('/selected/clear', methods=['DELETE'])
@@ -439,10 +496,10 @@ def clear_recommended_modules():
 @login_required  # Ensure the user is logged in before making this request
 def get_selected_modules():
     """Get the list of selected modules for the logged-in user."""
-    selected_modules = json.loads(current_user.selected_modules) if current_user.selected_modules else []
+    selected_modules = current_user.get_selected_modules()
 
-    # Print for debugging
-    print(f"Selected Modules for {current_user.email}: {selected_modules} (Type: {type(selected_modules)})")
+    # Debugging log (only written when DEBUG logging is enabled)
+    logger.debug("Selected Modules for %s: %s (Type: %s)", current_user.email, selected_modules, type(selected_modules))
 
     return jsonify({"selected_modules": selected_modules})  # Ensure it is a list
 
@@ -450,10 +507,10 @@ def get_selected_modules():
 @login_required  # Ensure the user is logged in before making this request
 def get_recommended_modules():
     """Get the list of recommended modules for the logged-in user."""
-    recommended_modules = json.loads(current_user.recommended_modules) if current_user.recommended_modules else []
+    recommended_modules = current_user.get_recommended_modules()
 
-    # Print for debugging
-    print(f"Recommended Modules for {current_user.email}: {recommended_modules} (Type: {type(recommended_modules)})")
+    # Debugging log (only written when DEBUG logging is enabled)
+    logger.debug("Recommended Modules for %s: %s (Type: %s)", current_user.email, recommended_modules, type(recommended_modules))
 
     return jsonify({"recommended_modules": recommended_modules})  # Ensure it is a list
 
@@ -468,7 +525,9 @@ def add_selected_modules():
     if not module_name:
         return jsonify({"error": "Module name is required"}), 400
 
-    current_user.add_selected_module(module_name)
+    if not current_user.add_selected_module(module_name):
+        return jsonify({"error": "Module not found"}), 404
+    db.session.commit()
     return jsonify({"message": "Module added to selected modules ", "saved_modules": current_user.get_selected_modules()})
 
 @module_bp.route('/selected_modules/remove', methods=['DELETE'])
@@ -482,6 +541,7 @@ def remove_selected_module():
         return jsonify({"error": "Module name is required"}), 400
 
     current_user.remove_selected_module(module_name)
+    db.session.commit()
     return jsonify({"message": "Module removed", "taught_modules": current_user.get_selected_modules()})
 
 @module_bp.route('/recommended_modules/remove', methods=['DELETE'])
@@ -495,38 +555,57 @@ def remove_recommended_module():
         return jsonify({"error": "Module name is required"}), 400
 
     current_user.remove_recommended_module(module_name)
+    db.session.commit()
     return jsonify({"message": "Module removed", "taught_modules": current_user.get_recommended_modules()})
 
 
 @module_bp.route('/modules_all', methods=['GET'])
+@cache.cached(query_string=True, response_filter=cache_success_only)
+@with_etag
 def get_all_modules():
     module_name = request.args.get('module_name', '')  # Get the module_name query parameter
     
+    # Select just the returned columns: the rows come back as tuples, without
+    # building a Module object for each one
+    stmt = select(
+        Module.id,
+        Module.name,
+        Module.outlook,
+        Module.positive_reviews,
+        Module.negative_reviews,
+        Module.category,
+        Module.summary,
+        Module.teacher_feedback_recommendation,
+        Module.teacher_feedback_recommendation_shortform,
+        Module.topics,
+        Module.analysis_refs,
+    )
     if module_name:
-        modules = Module.query.filter(Module.name.ilike(f'%{module_name}%')).all()  # Filter modules by name
-    else:
-        modules = Module.query.all()  # Return all modules if no filter is provided
-    
-    modules_list = []
-    for module in modules:
-        module_data = {
-            "id": module.id,
-            "name": module.name,
-            "outlook": module.outlook,
-            "positive": f"{module.positive_reviews}%",
-            "negative": f"{module.negative_reviews}%",
-            "categories": module.category,
-            "summary": module.summary,
-            "teacher_feedback_recommendation": module.teacher_feedback_recommendation,
-            "teacher_feedback_recommendation_shortform": module.teacher_feedback_recommendation_shortform,
-            "topics": module.topics,
-            "analysis_refs": module.analysis_refs,
+        stmt = stmt.where(Module.name.ilike(f'%{module_name}%'))  # Filter modules by name
+    # Otherwise return all modules
+
+    modules_list = [
+        {
+            "id": row.id,
+            "name": row.name,
+            "outlook": row.outlook,
+            "positive": f"{row.positive_reviews}%",
+            "negative": f"{row.negative_reviews}%",
+            "categories": row.category,
+            "summary": row.summary,
+            "teacher_feedback_recommendation": row.teacher_feedback_recommendation,
+            "teacher_feedback_recommendation_shortform": row.teacher_feedback_recommendation_shortform,
+            "topics": orjson.dumps(row.topics).decode(),  # The frontend parses the JSON text itself
+            "analysis_refs": row.analysis_refs,
         }
-        modules_list.append(module_data)
+        for row in db.session.execute(stmt)
+    ]
     
     return jsonify(modules_list)
 
 @module_bp.route('/topics_modules', methods=['GET'])
+@cache.cached(query_string=True, response_filter=cache_success_only)
+@with_etag
 def get_topics_by_module():
     try:
         module_name = request.args.get('name')  # Get module name from query params
@@ -535,7 +614,7 @@ def get_topics_by_module():
         if not module_name or not topic_name:
             return jsonify({"error": "Module name and topic are required"}), 400
 
-        topic_entry = TopicByModule.query.filter_by(name=module_name, topic=topic_name).first()
+        topic_entry = db.session.scalars(select(TopicByModule).filter_by(name=module_name, topic=topic_name)).first()
 
         if not topic_entry:
             return jsonify({"message": "No matching topic found"}), 404
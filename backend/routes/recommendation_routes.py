@@ -6,20 +6,28 @@ for users based on their preferences. It interacts with User, Module,
 and TopicByModule models.
 """
 
+# Standard library imports
+import logging
+
+# Third-party imports
 from flask import Blueprint, request, jsonify
 from models import User, Module, TopicByModule, db  # database and required tables
 from flask_login import login_required, current_user
-import json
+from sqlalchemy import select
 
 
 # Create a Blueprint instance named 'recommendation'.
 # Routes defined here will be prefixed (e.g., /recommendations) when registered.
 rec_bp = Blueprint('recommendation', __name__)
 
+logger = logging.getLogger(__name__)
+
 # Add to recommended list of modules
 def add_recommended_modules(module_name: str):
     """Add a module to recommended_modules."""
-    current_user.add_recommended_module(module_name)
+    if not current_user.add_recommended_module(module_name):
+        return jsonify({"error": "Module not found"}), 404
+    db.session.commit()
     return jsonify({"message": "Module added to recommended modules ", "recommended_modules": current_user.get_recommended_modules()})
 
 @rec_bp.route('/generate_recommendations_student', methods=['POST'])
@@ -31,46 +39,29 @@ def generate_user_recommendations():
     data = request.json  # Receive JSON data from the frontend
 
     # Log the incoming request for debugging
-    print("Received data:", data)
+    logger.debug("Received data: %s", data)
 
-    # Remove all previously recommended modules for the current user
+    # Log the previously recommended modules; they are replaced below
     existing_modules = current_user.get_recommended_modules()
-    for module in existing_modules:
-        current_user.remove_recommended_module(module)
-    
-    # Log the existing modules before removal
-    print("Existing modules before removal:", existing_modules)
-
-    # Remove all previously recommended modules for the current user
-    for module in existing_modules:
-        current_user.remove_recommended_module(module)
-
-    # Log the state of recommended modules after removal
-    remaining_modules = current_user.get_recommended_modules()
-    print("Remaining modules after removal:", remaining_modules)
-
-    if not remaining_modules:
-        print("All old recommendations have been successfully removed.")
-    else:
-        print(f"There are still {len(remaining_modules)} modules remaining in the recommendations.")
+    logger.debug("Existing modules before replacement: %s", existing_modules)
 
     # Extract user preferences
     priority_order = data.get("user_priority", [])
-    print(f"The user's priorities {priority_order}.")
+    logger.debug("The user's priorities %s.", priority_order)
     selected_importance = data.get("selected_importance", 1)
-    print(f"Degree to which the user cares about feelings {selected_importance}.")
+    logger.debug("Degree to which the user cares about feelings %s.", selected_importance)
     selected_categories = data.get("selected_categories", [])
-    print(f"subject area the user cares about {selected_categories}.")
+    logger.debug("subject area the user cares about %s.", selected_categories)
     selected_aspects = data.get("selected_aspects", [])
-    print(f"topics that the user cares about {selected_aspects}.")
+    logger.debug("topics that the user cares about %s.", selected_aspects)
 
     # Initialize shortlist and retrieve all modules
-    shortlist = [module.name for module in Module.query.all()]  # Get all module names
+    shortlist = db.session.scalars(select(Module.name).order_by(Module.id)).all()  # Get all module names, in id order
 
     # Mapping priorities to functions
     priority_mapping = {1: filter_by_feelings, 2: filter_by_subject, 3: filter_by_aspect}
     
-    print(f"Initial shortlist (all modules): {shortlist}")
+    logger.debug("Initial shortlist (all modules): %s", shortlist)
 
     for priority in priority_order:  # Reverse the priority order for filtering?
         filter_function = priority_mapping.get(priority)
@@ -81,15 +72,16 @@ def generate_user_recommendations():
                 shortlist = filter_by_subject(shortlist, selected_categories)
             elif priority == 3:
                 shortlist = filter_by_aspect(shortlist, selected_aspects)
-            print(f"Shortlist after applying {filter_function.__name__}: {shortlist}")  # Debugging output
+            logger.debug("Shortlist after applying %s: %s", filter_function.__name__, shortlist)
     if selected_importance <= 2:
         shortlist = filter_by_feelings(shortlist, selected_importance)
 
-    # Ensure that we only add **module names**, not jsonify responses
-    for module in shortlist:
-        current_user.add_recommended_module(module)  # Add directly to the user's recommended modules
+    # Replace the user's recommended modules with the shortlist (module names only,
+    # duplicates dropped, order kept) and save it in a single commit
+    current_user.set_recommended_modules(shortlist)
+    db.session.commit()
 
-    print("Final shortlist before returning:", shortlist)  # Debugging output
+    logger.debug("Final shortlist before returning: %s", shortlist)
 
     return jsonify({"recommended_modules": shortlist})  # Ensure it returns a proper JSON object
 
@@ -97,22 +89,18 @@ def filter_by_aspect(shortlist, selected_aspects):
     '''
     Filter modules based on topics from TopicByModule table and selected aspects.
     '''
-    filtered_list = shortlist  # Start with the full shortlist
-
-    for module_name in shortlist:
-        module_topics = TopicByModule.query.filter_by(name=module_name).all()
+    # One query for the whole shortlist: the names of modules with any selected
+    # aspect that has positive reviews >= 70.
+    valid_modules = set(db.session.scalars(
+        select(TopicByModule.name).where(
+            TopicByModule.name.in_(shortlist),
+            TopicByModule.topic.in_(selected_aspects),
+            TopicByModule.positive_reviews_topic >= 70,
+        )
+    ))
 
-        # Check for any matching aspect with positive reviews > 70
-        valid_module = False
-        for topic in module_topics:
-            if topic.topic in selected_aspects and topic.positive_reviews_topic >= 70:
-                valid_module = True
-                break
-
-        if not valid_module:
-            filtered_list.remove(module_name)  # Remove module if it doesn't match
-
-    return filtered_list
+    # Keep the shortlist order, dropping modules without a matching aspect
+    return [module_name for module_name in shortlist if module_name in valid_modules]
 
 
 def filter_by_feelings(shortlist, selected_importance):
@@ -125,23 +113,23 @@ def filter_by_feelings(shortlist, selected_importance):
     
     # do filtering by feelings
 
-    filtered_list = shortlist  # Start with the full shortlist
+    # Fetch the review percentages of every shortlisted module in one query
+    positive_reviews = dict(db.session.execute(
+        select(Module.name, Module.positive_reviews).where(Module.name.in_(shortlist))
+    ).all())
 
+    filtered_list = []
     for module_name in shortlist:
-        module_data = Module.query.filter_by(name=module_name).first()
-
          # Check if the module data exists
-        if not module_data:
-            print(f"Module {module_name} not found.")
-            continue  # Skip this module if it's not found in the database
-
-        # Log the review and emotion values to debug
-        print(f"Module {module_name}: Positive Reviews = {module_data.positive_reviews}")
-
-        if selected_importance <= 2:
-            if module_data.positive_reviews < 70:
-                print(f"Removing {module_name} because it doesn't have positive reviews.")
-                filtered_list.remove(module_name)  # Remove if it doesn't meet the criteria
+        if module_name not in positive_reviews:
+            logger.debug("Module %s not found.", module_name)
+            filtered_list.append(module_name)  # Modules missing from the database are not filtered out
+            continue
+
+        if (positive_reviews[module_name] or 0) < 70:
+            logger.debug("Removing %s because it doesn't have positive reviews.", module_name)
+            continue  # Drop it if it doesn't meet the criteria
+        filtered_list.append(module_name)
     return filtered_list
 
 
@@ -171,10 +159,11 @@ def filter_by_subject(shortlist, selected_categories):
         "Quantum Computing": ['The Introduction to Quantum Computing', 'Quantum Information Theory'],
         "Software Engineering": ['Object-Oriented Design', 'Mobile App Development with Flutter', 'Software Testing and Quality Assurance', 'Microservices Architecture']
     }
+    shortlisted = set(shortlist)  # Constant-time membership checks below
     for category in selected_categories:
         if category in modules_each_cat:
             # Add modules from the matching category to the filtered list
-            filtered_list.extend([module for module in modules_each_cat[category] if module in shortlist])
+            filtered_list.extend([module for module in modules_each_cat[category] if module in shortlisted])
 
     return filtered_list
 
@@ -182,9 +171,4 @@ def get_saved_modules2():
     '''
     Retrieve saved modules for the current user.
     '''
-    saved_modules = current_user.saved_modules  # Assuming this is a list of module names (strings)
-
-    if isinstance(saved_modules, str):  # If it's a string, convert it back to a list
-        saved_modules = json.loads(saved_modules)
-
-    return saved_modules  # Ensure we return a proper list
+    return current_user.get_saved_modules()  # A list of module names (strings)
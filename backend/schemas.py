@@ -0,0 +1,37 @@
+"""
+Request body schemas.
+
+This module defines pydantic models for the JSON bodies of the authentication
+endpoints. A view validates the raw request body in one call
+(`Model.model_validate_json(request.get_data())`): pydantic-core parses the
+JSON and checks every field in compiled code, and a bad body is rejected with
+a ValidationError before any database work or password hashing happens.
+"""
+
+from typing import Annotated, Literal, Optional
+
+from pydantic import BaseModel, StringConstraints
+
+from models import USER_ROLES
+
+# A string that must not be empty, matching the views' old `if not value` checks.
+NonEmptyStr = Annotated[str, StringConstraints(min_length=1)]
+
+# Shape of an email address: something@domain.tld with no spaces. Only checked at
+# registration, so a typo is rejected before the password is hashed; login
+# accepts any string, as some existing accounts were registered without the check.
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+
+class RegisterRequest(BaseModel):
+    """Body of POST /auth/register. Unknown keys are ignored."""
+    email: Annotated[str, StringConstraints(pattern=EMAIL_PATTERN)]
+    password: NonEmptyStr
+    name: NonEmptyStr
+    role: Literal[USER_ROLES]
+    # Only kept for students; the column holds up to 10 characters ('First', ..., 'Final').
+    year: Optional[Annotated[str, StringConstraints(max_length=10)]] = None
+
+class LoginRequest(BaseModel):
+    """Body of POST /auth/login. Unknown keys are ignored."""
+    email: NonEmptyStr
+    password: NonEmptyStr
@@ -0,0 +1,43 @@
+"""
+Shared pytest fixtures.
+
+Each test gets an app bound to its own empty SQLite database, created with
+the migrations (as `flask db upgrade` would), and runs inside its app context.
+"""
+
+import pytest
+from flask_migrate import upgrade
+
+from app import create_app
+from database import db
+from models import User
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SECRET_KEY': 'test',
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'RATELIMIT_ENABLED': False,
+    })
+    with app.app_context():
+        upgrade()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def make_user(app):
+    """Create and commit a student. Without a password the stored hash is a placeholder, which skips hashing."""
+    def make_user(email='student@example.com', password=None):
+        user = User(email=email, name='Student', role='Student', password_hash='unused')
+        if password is not None:
+            user.set_password(password)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make_user
@@ -0,0 +1,32 @@
+"""Tests for the application factory (app.py)."""
+
+from sqlalchemy import text
+
+from app import create_app, short_circuit_cheap_requests
+from database import db
+
+def test_in_memory_sqlite_database():
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    with app.app_context():
+        assert db.session.execute(text('SELECT 1')).scalar() == 1
+        db.session.remove()
+
+def test_file_database_gets_a_queue_pool(app):
+    assert db.engine.pool.size() == 10
+
+def test_health_check_runs_before_other_hooks(app, client):
+    assert app.before_request_funcs[None][0] is short_circuit_cheap_requests
+
+    response = client.get('/healthz')
+
+    assert response.status_code == 204
+
+def test_preflight_is_answered_with_cors_headers(client):
+    response = client.options('/auth/login', headers={
+        'Origin': 'http://localhost:8081',
+        'Access-Control-Request-Method': 'POST',
+    })
+
+    assert response.status_code == 204
+    assert response.headers['Access-Control-Allow-Origin'] == 'http://localhost:8081'
+    assert response.headers['Access-Control-Max-Age'] == '86400'
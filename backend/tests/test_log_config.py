@@ -0,0 +1,40 @@
+"""Tests for the logging setup (log_config.py)."""
+
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+import log_config
+
+@pytest.fixture
+def root_logger():
+    """The root logger, with its handlers and level restored after the test."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    for handler in root.handlers:
+        if handler not in handlers:
+            root.removeHandler(handler)
+    root.setLevel(level)
+
+def queue_handlers(root):
+    return [handler for handler in root.handlers if isinstance(handler, QueueHandler)]
+
+def test_init_logging_is_idempotent(root_logger):
+    for handler in queue_handlers(root_logger):
+        root_logger.removeHandler(handler)
+
+    log_config.init_logging()
+    log_config.init_logging()
+
+    assert len(queue_handlers(root_logger)) == 1
+
+def test_init_logging_keeps_configured_level(root_logger):
+    for handler in queue_handlers(root_logger):
+        root_logger.removeHandler(handler)
+    root_logger.setLevel(logging.ERROR)
+
+    log_config.init_logging()
+
+    assert root_logger.level == logging.ERROR
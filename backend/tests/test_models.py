@@ -0,0 +1,35 @@
+"""Tests for the model helpers (models.py)."""
+
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+
+from database import db
+from models import Module
+
+def test_legacy_password_hash_is_upgraded(make_user):
+    user = make_user()
+    user.password_hash = generate_password_hash("secret", method="pbkdf2:sha256")
+
+    assert not user.check_password("wrong")
+    assert user.password_hash.startswith("pbkdf2:")
+    assert user.check_password("secret")
+    assert user.password_hash.startswith("$argon2id$")
+    assert user.check_password("secret")
+
+def test_set_modules_skips_unchanged_list_with_unknown_names(make_user):
+    db.session.add_all([Module(name="Algorithms"), Module(name="Databases")])
+    user = make_user()
+    user.set_selected_modules(["Databases", "Unknown", "Algorithms", "Databases"])
+    db.session.commit()
+    assert user.get_selected_modules() == ["Databases", "Algorithms"]
+
+    statements = []
+    listen = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listen)
+    try:
+        user.set_selected_modules(["Databases", "Unknown", "Algorithms"])
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listen)
+
+    assert not [s for s in statements if s.startswith(("DELETE", "INSERT"))]
+    assert user.get_selected_modules() == ["Databases", "Algorithms"]
@@ -0,0 +1,79 @@
+"""Tests for the module catalog routes (routes/module_routes.py)."""
+
+from database import db
+from models import Module
+
+def add_module(name, **values):
+    db.session.add(Module(name=name, category="Computing", **values))
+    db.session.commit()
+
+def test_get_module_by_title(client):
+    add_module("Databases", outlook="Positive", teacher_feedback_recommendation="Keep it up", similar_modules=["Networks"])
+
+    response = client.get("/modules/Databases")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["title"] == "Databases"
+    assert body["outlook"] == "Positive"
+    assert body["teacher_feedback_recommendation"] == "Keep it up"
+    assert body["similar_modules"] == ["Networks"]
+
+def test_get_module_by_title_not_found(client):
+    add_module("Databases")
+
+    response = client.get("/modules/Networks")
+
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "Module not found"}
+
+NEW_MODULE = {
+    "title": "Compilers",
+    "outlook": "Positive",
+    "positive_reviews": 70,
+    "negative_reviews": 30,
+    "category": "Computing",
+    "teacher_feedback_recommendation": "Keep it up",
+    "similar_modules": ["Databases"],
+}
+
+def test_add_module(client):
+    response = client.post("/modules/add", json=NEW_MODULE)
+
+    assert response.status_code == 201
+    module = db.session.scalars(db.select(Module).filter_by(name="Compilers")).one()
+    assert module.positive_reviews == 70
+    assert module.similar_modules == ["Databases"]
+
+def test_add_module_duplicate(client):
+    add_module("Compilers", outlook="Negative")
+
+    response = client.post("/modules/add", json=NEW_MODULE)
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Module already exists"}
+    assert db.session.scalars(db.select(Module.outlook).filter_by(name="Compilers")).all() == ["Negative"]
+
+def test_add_saved_module(client, make_user):
+    add_module("Databases")
+    make_user(password="secret")
+    client.post("/auth/login", json={"email": "student@example.com", "password": "secret"})
+
+    response = client.post("/modules/saved_modules/add", json={"module_name": "Databases"})
+    assert response.status_code == 200
+    assert response.get_json()["saved_modules"] == ["Databases"]
+
+    # Adding it again leaves the list as it is
+    response = client.post("/modules/saved_modules/add", json={"module_name": "Databases"})
+    assert response.status_code == 200
+    assert response.get_json()["saved_modules"] == ["Databases"]
+
+def test_add_saved_module_unknown(client, make_user):
+    user = make_user(password="secret")
+    client.post("/auth/login", json={"email": "student@example.com", "password": "secret"})
+
+    response = client.post("/modules/saved_modules/add", json={"module_name": "Networks"})
+
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "Module not found"}
+    assert user.get_saved_modules() == []
@@ -0,0 +1,77 @@
+"""Tests for reloading the module catalog from CSV (populate_db.py)."""
+
+import pandas as pd
+import pytest
+
+import populate_db
+from database import db
+from models import Module
+
+def write_module_csv(path, names, outlook):
+    """Write a module CSV with one row per name and every loaded column filled in."""
+    rows = [
+        {column: "" for column in populate_db.MODULE_COLUMNS} | {
+            "module_name": name,
+            "outlook": outlook,
+            "positive_reviews": "60%",
+            "negative_reviews": "40%",
+            "category": "Computing",
+            "topics": "Lectures,Labs",
+        }
+        for name in names
+    ]
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+@pytest.fixture
+def seed(app, tmp_path, monkeypatch):
+    """Run populate_database() with a module CSV listing the given names."""
+    modules_csv = tmp_path / "modules.csv"
+    topics_csv = tmp_path / "topics.csv"
+    pd.DataFrame(columns=list(populate_db.TOPIC_COLUMNS)).to_csv(topics_csv, index=False)
+    monkeypatch.setattr(populate_db, "MODULES_CSV_PATH", str(modules_csv))
+    monkeypatch.setattr(populate_db, "TOPICS_CSV_PATH", str(topics_csv))
+
+    def seed(names, outlook="Positive"):
+        write_module_csv(modules_csv, names, outlook)
+        populate_db.populate_database()
+    return seed
+
+def test_reseed_keeps_user_lists(seed, make_user):
+    seed(["Algorithms", "Databases", "Networks"])
+    user = make_user()
+    user.add_saved_module("Networks")
+    user.add_saved_module("Algorithms")
+    db.session.commit()
+    ids = dict(db.session.execute(db.select(Module.name, Module.id)).all())
+
+    # Reload with the rows in a different order and a changed value
+    seed(["Networks", "Databases", "Algorithms"], outlook="Mixed")
+
+    assert user.get_saved_modules() == ["Networks", "Algorithms"]
+    assert dict(db.session.execute(db.select(Module.name, Module.id)).all()) == ids
+    assert db.session.scalar(db.select(Module.outlook).filter_by(name="Networks")) == "Mixed"
+
+def test_reseed_removes_modules_missing_from_csv(seed, make_user):
+    seed(["Algorithms", "Databases", "Networks"])
+    user = make_user()
+    user.add_saved_module("Databases")
+    user.add_saved_module("Networks")
+    db.session.commit()
+
+    seed(["Algorithms", "Networks"])
+
+    assert db.session.scalars(db.select(Module.name).order_by(Module.name)).all() == ["Algorithms", "Networks"]
+    assert user.get_saved_modules() == ["Networks"]
+
+def test_seed_with_repeated_module_name(seed):
+    seed(["Algorithms", "Databases", "Algorithms"])
+
+    assert db.session.scalars(db.select(Module.name).order_by(Module.name)).all() == ["Algorithms", "Databases"]
+
+def test_reseed_clears_cached_catalog(seed, client):
+    seed(["Algorithms"])
+    assert client.get("/modules/modules/titles").get_json() == ["Algorithms"]
+
+    seed(["Algorithms", "Databases"])
+
+    assert client.get("/modules/modules/titles").get_json() == ["Algorithms", "Databases"]
@@ -0,0 +1,41 @@
+"""Tests for the CSV module loader (processed_data.py)."""
+
+import csv
+
+import processed_data
+from database import db
+from models import Module
+
+def write_csv(path, rows):
+    """Write rows (dicts) as a CSV with the columns populate_from_csv reads."""
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["title", "outlook", "positive_reviews", "negative_reviews", "category"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+def test_populate_from_csv_parses_percentages(app, tmp_path):
+    path = tmp_path / "modules.csv"
+    write_csv(path, [
+        {"title": "Algorithms", "outlook": "Positive", "positive_reviews": "85%", "negative_reviews": "15%", "category": "Computing"},
+        {"title": "Databases", "outlook": "Neutral", "positive_reviews": "", "negative_reviews": "n/a", "category": "Computing"},
+    ])
+
+    processed_data.populate_from_csv(str(path))
+
+    reviews = db.session.execute(
+        db.select(Module.name, Module.positive_reviews, Module.negative_reviews).order_by(Module.name)
+    ).all()
+    assert [tuple(row) for row in reviews] == [("Algorithms", 85, 15), ("Databases", 0, 0)]
+
+def test_populate_from_csv_rolls_back_failed_batch(app, tmp_path, monkeypatch):
+    path = tmp_path / "modules.csv"
+    write_csv(path, [
+        {"title": name, "outlook": "Positive", "positive_reviews": "50%", "negative_reviews": "50%", "category": "Computing"}
+        for name in ["Algorithms", "Databases", "Algorithms"]
+    ])
+    monkeypatch.setattr(processed_data, "CSV_BATCH_SIZE", 2)
+
+    processed_data.populate_from_csv(str(path))
+
+    names = db.session.scalars(db.select(Module.name).order_by(Module.name)).all()
+    assert names == ["Algorithms", "Databases"]
@@ -0,0 +1,49 @@
+"""Tests for the recommendation shortlist filters (routes/recommendation_routes.py)."""
+
+import pytest
+
+from database import db
+from models import Module, TopicByModule
+from routes.recommendation_routes import filter_by_aspect, filter_by_feelings
+
+# Module name -> positive review percentage. Databases and Networks are next
+# to each other and both below the 70% cut-off, so a filter that removes items
+# from the list it iterates over would skip Networks and keep it.
+POSITIVE_REVIEWS = {"Algorithms": 90, "Databases": 40, "Networks": 20, "Compilers": 75}
+
+@pytest.fixture
+def modules(app):
+    for name, positive_reviews in POSITIVE_REVIEWS.items():
+        module = Module(name=name, positive_reviews=positive_reviews)
+        db.session.add(module)
+        db.session.flush()
+        db.session.add(TopicByModule(module_id=module.id, name=name, topic="Lectures", positive_reviews_topic=positive_reviews))
+    db.session.commit()
+    return list(POSITIVE_REVIEWS)
+
+def test_filter_by_feelings_drops_adjacent_modules(modules):
+    assert filter_by_feelings(modules, 1) == ["Algorithms", "Compilers"]
+
+def test_filter_by_feelings_keeps_everything_at_low_importance(modules):
+    assert filter_by_feelings(modules, 3) == modules
+
+def test_filter_by_feelings_keeps_unknown_modules(modules):
+    assert filter_by_feelings(["Unknown", "Networks", "Algorithms"], 1) == ["Unknown", "Algorithms"]
+
+def test_filter_by_aspect_drops_adjacent_modules(modules):
+    assert filter_by_aspect(modules, ["Lectures"]) == ["Algorithms", "Compilers"]
+    assert filter_by_aspect(modules, ["Labs"]) == []
+
+def test_generate_recommendations(client, make_user, modules):
+    user = make_user(password="secret")
+    client.post("/auth/login", json={"email": "student@example.com", "password": "secret"})
+
+    response = client.post("/recommendations/generate_recommendations_student", json={
+        "user_priority": [1, 3],
+        "selected_importance": 1,
+        "selected_aspects": ["Lectures"],
+    })
+
+    assert response.status_code == 200
+    assert response.get_json() == {"recommended_modules": ["Algorithms", "Compilers"]}
+    assert user.get_recommended_modules() == ["Algorithms", "Compilers"]
@@ -0,0 +1,20 @@
+"""
+WSGI entry point for production servers.
+
+Builds the Flask application once through the `create_app` factory and
+exposes it as `app` so it can be served by a multi-process/multi-threaded
+WSGI server instead of the Werkzeug development server. Run from the
+backend directory, gunicorn picks up its settings from gunicorn.conf.py:
+
+    gunicorn wsgi:app
+
+The app is preloaded (preload_app / --preload), so this module is imported once in the gunicorn master and the
+workers are forked from it, sharing the imported code and configuration
+(including a generated SECRET_KEY) instead of each building its own app.
+No database or Redis connection is opened while the app is created, so no
+socket is inherited across the fork.
+"""
+
+from app import create_app  # Application factory
+
+app = create_app()